@@ -107,54 +107,7 @@ class ContentLogger:
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Extract data from result
-                prediction = result.get('prediction', 'unknown')
-                confidence = result.get('confidence', 0.0)
-                threat_score = result.get('threat_score', 0.0)
-                threat_type = result.get('threat_type', '')
-                severity = result.get('severity', '')
-                is_fake = result.get('is_fake', False)
-                is_real = result.get('is_real', False)
-                model_type = result.get('model_type', '')
-                
-                # Handle complex fields
-                indicators = json.dumps(result.get('indicators', []))
-                recommendations = json.dumps(result.get('recommendations', []))
-                
-                cursor.execute("""
-                    INSERT INTO flagged_content (
-                        timestamp, content, vip_name, platform, prediction, confidence,
-                        threat_score, threat_type, severity, is_fake, is_real, model_type,
-                        indicators, recommendations, user_id, post_id, url
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    datetime.now().isoformat(),
-                    text,
-                    vip_name,
-                    platform,
-                    prediction,
-                    confidence,
-                    threat_score,
-                    threat_type,
-                    severity,
-                    is_fake,
-                    is_real,
-                    model_type,
-                    indicators,
-                    recommendations,
-                    kwargs.get('user_id'),
-                    kwargs.get('post_id'),
-                    kwargs.get('url')
-                ))
-                
-                content_id = cursor.lastrowid
-                
-                # Create alert if high severity
-                if severity in ['high', 'critical'] or (is_fake and confidence > 0.8):
-                    self._create_alert(cursor, content_id, severity, prediction, confidence)
-                
+                content_id = self._insert_alert(conn.cursor(), text, result, vip_name, platform, **kwargs)
                 conn.commit()
                 logger.info(f"Flagged content saved with ID: {content_id}")
                 return content_id
@@ -163,6 +116,81 @@ class ContentLogger:
             logger.error(f"Failed to save alert: {e}")
             return None
     
+    def save_alerts(self, alerts: List[Dict]) -> List[Optional[int]]:
+        """
+        Save several flagged items in one connection and one transaction
+        
+        Args:
+            alerts: Dicts with save_alert's arguments (text, result, vip_name, platform, ...)
+            
+        Returns:
+            Database IDs of the saved records, or Nones if the batch failed
+        """
+        if not alerts:
+            return []
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                content_ids = [self._insert_alert(cursor, **alert) for alert in alerts]
+                conn.commit()
+                logger.info(f"Saved {len(content_ids)} flagged content records")
+                return content_ids
+                
+        except Exception as e:
+            logger.error(f"Failed to save alerts: {e}")
+            return [None] * len(alerts)
+    
+    def _insert_alert(self, cursor, text: str, result: Dict, vip_name: str = None,
+                      platform: str = None, **kwargs) -> int:
+        """Insert one flagged_content row (plus its alert if high priority) without committing"""
+        # Extract data from result
+        prediction = result.get('prediction', 'unknown')
+        confidence = result.get('confidence', 0.0)
+        threat_score = result.get('threat_score', 0.0)
+        threat_type = result.get('threat_type', '')
+        severity = result.get('severity', '')
+        is_fake = result.get('is_fake', False)
+        is_real = result.get('is_real', False)
+        model_type = result.get('model_type', '')
+        
+        # Handle complex fields
+        indicators = json.dumps(result.get('indicators', []))
+        recommendations = json.dumps(result.get('recommendations', []))
+        
+        cursor.execute("""
+            INSERT INTO flagged_content (
+                timestamp, content, vip_name, platform, prediction, confidence,
+                threat_score, threat_type, severity, is_fake, is_real, model_type,
+                indicators, recommendations, user_id, post_id, url
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            datetime.now().isoformat(),
+            text,
+            vip_name,
+            platform,
+            prediction,
+            confidence,
+            threat_score,
+            threat_type,
+            severity,
+            is_fake,
+            is_real,
+            model_type,
+            indicators,
+            recommendations,
+            kwargs.get('user_id'),
+            kwargs.get('post_id'),
+            kwargs.get('url')
+        ))
+        
+        content_id = cursor.lastrowid
+        
+        # Create alert if high severity
+        if severity in ['high', 'critical'] or (is_fake and confidence > 0.8):
+            self._create_alert(cursor, content_id, severity, prediction, confidence)
+        
+        return content_id
+    
     def _create_alert(self, cursor, content_id: int, severity: str, 
                      prediction: str, confidence: float):
         """Create alert for high-priority content"""
@@ -272,3 +300,15 @@ def save_alert(text: str, result: Dict, vip_name: str = None,
     """
     logger = get_content_logger()
     return logger.save_alert(text, result, vip_name, platform, **kwargs)
+
+def save_alerts(alerts: List[Dict]) -> List[Optional[int]]:
+    """
+    Convenience function to save several flagged items in one transaction
+    
+    Args:
+        alerts: Dicts with save_alert's arguments
+        
+    Returns:
+        Database IDs of saved records
+    """
+    return get_content_logger().save_alerts(alerts)
@@ -13,7 +13,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from ml_classifier import classify_text, is_high_risk_content
+    from ml_classifier import classify_text, is_high_risk_result
     from fact_checker import enhanced_fact_check, get_fact_checker
     from content_logger import save_alert
     ML_AVAILABLE = True
@@ -43,8 +43,9 @@ def enhanced_content_analysis(text: str, vip_name: str = None, platform: str = N
     # ML Classification
     if ML_AVAILABLE:
         try:
+            # One classification serves both the prediction and the high-risk flag
             ml_result = classify_text(text)
-            high_risk = is_high_risk_content(text)
+            high_risk = is_high_risk_result(ml_result)
             
             analysis_result["ml_classification"] = {
                 "prediction": ml_result.get("prediction", "unknown"),
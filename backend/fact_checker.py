@@ -4,7 +4,9 @@ Fact Checker Integration for Protego System
 Integrates Google Fact Check Tools API with ML pipeline
 """
 
+import asyncio
 import os
+import aiohttp
 import requests
 import logging
 from typing import Dict, List, Optional, Any
@@ -37,46 +39,42 @@ class FactChecker:
             Dictionary with fact-check results
         """
         if not self.api_key:
+            return self._missing_key_result()
+        
+        try:
+            response = requests.get(self.base_url, params=self._query_params(claim), timeout=10)
+            
+            if response.status_code == 200:
+                return self._claims_result(response.json())
+            return self._api_error_result(response.status_code, response.text)
+                
+        except requests.RequestException as e:
+            logger.error(f"Fact-check API request failed: {e}")
             return {
-                "error": "API key not configured",
+                "error": f"Request failed: {str(e)}",
                 "has_fact_checks": False,
                 "claims": []
             }
+        except Exception as e:
+            logger.error(f"Fact-check error: {e}")
+            return {
+                "error": f"Unexpected error: {str(e)}",
+                "has_fact_checks": False,
+                "claims": []
+            }
+    
+    async def fact_check_claim_async(self, session: aiohttp.ClientSession, claim: str) -> Dict[str, Any]:
+        """Async variant of fact_check_claim on a caller-provided aiohttp session"""
+        if not self.api_key:
+            return self._missing_key_result()
         
         try:
-            params = {
-                "query": claim,
-                "key": self.api_key
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if "claims" in data and data["claims"]:
-                    return {
-                        "has_fact_checks": True,
-                        "claims": data["claims"],
-                        "total_results": len(data["claims"]),
-                        "timestamp": datetime.now().isoformat()
-                    }
-                else:
-                    return {
-                        "has_fact_checks": False,
-                        "claims": [],
-                        "message": "No fact-check results found",
-                        "timestamp": datetime.now().isoformat()
-                    }
-            else:
-                return {
-                    "error": f"API Error: {response.status_code}",
-                    "message": response.text,
-                    "has_fact_checks": False,
-                    "claims": []
-                }
+            async with session.get(self.base_url, params=self._query_params(claim)) as response:
+                if response.status == 200:
+                    return self._claims_result(await response.json())
+                return self._api_error_result(response.status, await response.text())
                 
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Fact-check API request failed: {e}")
             return {
                 "error": f"Request failed: {str(e)}",
@@ -91,6 +89,45 @@ class FactChecker:
                 "claims": []
             }
     
+    def _query_params(self, claim: str) -> Dict[str, str]:
+        return {
+            "query": claim,
+            "key": self.api_key
+        }
+    
+    @staticmethod
+    def _missing_key_result() -> Dict[str, Any]:
+        return {
+            "error": "API key not configured",
+            "has_fact_checks": False,
+            "claims": []
+        }
+    
+    @staticmethod
+    def _claims_result(data: Dict) -> Dict[str, Any]:
+        if "claims" in data and data["claims"]:
+            return {
+                "has_fact_checks": True,
+                "claims": data["claims"],
+                "total_results": len(data["claims"]),
+                "timestamp": datetime.now().isoformat()
+            }
+        return {
+            "has_fact_checks": False,
+            "claims": [],
+            "message": "No fact-check results found",
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _api_error_result(status: int, body: str) -> Dict[str, Any]:
+        return {
+            "error": f"API Error: {status}",
+            "message": body,
+            "has_fact_checks": False,
+            "claims": []
+        }
+    
     def analyze_fact_check_results(self, fact_check_data: Dict) -> Dict[str, Any]:
         """
         Analyze fact-check results to determine credibility
@@ -168,9 +205,13 @@ class FactChecker:
         Returns:
             Comprehensive fact-check analysis
         """
-        # Get fact-check results
-        fact_check_results = self.fact_check_claim(text)
-        
+        return self._build_claim_analysis(text, self.fact_check_claim(text))
+    
+    async def enhanced_claim_analysis_async(self, session: aiohttp.ClientSession, text: str) -> Dict[str, Any]:
+        """Async variant of enhanced_claim_analysis on a caller-provided aiohttp session"""
+        return self._build_claim_analysis(text, await self.fact_check_claim_async(session, text))
+    
+    def _build_claim_analysis(self, text: str, fact_check_results: Dict[str, Any]) -> Dict[str, Any]:
         # Analyze the results
         credibility_analysis = self.analyze_fact_check_results(fact_check_results)
         
@@ -260,3 +301,21 @@ def enhanced_fact_check(text: str) -> Dict[str, Any]:
     """
     checker = get_fact_checker()
     return checker.enhanced_claim_analysis(text)
+
+
+async def enhanced_fact_check_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Enhanced fact-checking for several texts, with the API requests in flight together
+    
+    Args:
+        texts: Texts to analyze
+        
+    Returns:
+        Complete fact-check analyses, in the order of texts
+    """
+    checker = get_fact_checker()
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        return await asyncio.gather(
+            *(checker.enhanced_claim_analysis_async(session, text) for text in texts)
+        )
@@ -6,18 +6,54 @@ Provides simple classification functions for service integration
 
 import os
 import logging
+import threading
 import joblib
-from typing import Dict, Optional
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _load_model_files(vectorizer_path: str, model_path: str):
+    """Unpickle the vectorizer and model once per process; the model's arrays are memory-mapped"""
+    return (
+        joblib.load(vectorizer_path),
+        joblib.load(model_path, mmap_mode="r"),
+        _load_linear_weights(model_path)
+    )
+
+def _load_linear_weights(model_path: str):
+    """(coef, intercept) saved beside a binary model as .npz, unless missing or older than the model"""
+    weights_path = os.path.splitext(model_path)[0] + ".npz"
+    try:
+        if os.stat(weights_path).st_mtime < os.stat(model_path).st_mtime:
+            return None
+        with np.load(weights_path) as data:
+            coef, intercept = data["coef"], data["intercept"]
+    except (OSError, KeyError, ValueError):
+        return None
+    return (coef, intercept) if coef.shape[0] == 1 else None
+
+def predict_fast(X, coef: np.ndarray, intercept: np.ndarray) -> np.ndarray:
+    """Binary logistic-regression probabilities, ordered like predict_proba, from raw weights"""
+    p = np.asarray(1.0 / (1.0 + np.exp(-(X @ coef.T + intercept)))).ravel()
+    return np.column_stack([1.0 - p, p])
+
+HIGH_RISK_THRESHOLD = 0.7
+
+def batch_flags(probs: np.ndarray, fake_col: int = 0, threshold: float = HIGH_RISK_THRESHOLD) -> np.ndarray:
+    """High-risk flag per row: the fake-class probability meets the threshold"""
+    return probs[:, fake_col] >= threshold
+
 class ThreatClassifier:
     """Simple threat classifier using trained models"""
     
     def __init__(self):
         self.vectorizer = None
         self.model = None
+        self.weights = None
         self.is_loaded = False
         self._load_models()
     
@@ -28,8 +64,7 @@ class ThreatClassifier:
             model_path = "backend/monitoring/threat_model.joblib"
             
             if os.path.exists(vectorizer_path) and os.path.exists(model_path):
-                self.vectorizer = joblib.load(vectorizer_path)
-                self.model = joblib.load(model_path)
+                self.vectorizer, self.model, self.weights = _load_model_files(vectorizer_path, model_path)
                 self.is_loaded = True
                 logger.info("ML models loaded successfully")
             else:
@@ -48,51 +83,85 @@ class ThreatClassifier:
         Returns:
             Dict with prediction results
         """
+        return self.classify_texts([text])[0]
+    
+    def classify_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Classify several texts with one vectorizer transform and one model call
+        
+        Args:
+            texts: Contents to classify
+            
+        Returns:
+            List of prediction dicts, one per text
+        """
         if not self.is_loaded:
-            return {
+            return [{
                 "error": "Models not loaded",
                 "prediction": "unknown",
                 "confidence": 0.0
-            }
+            } for _ in texts]
         
         try:
-            # Transform text using TF-IDF vectorizer
-            X = self.vectorizer.transform([text])
+            # Transform texts using TF-IDF vectorizer
+            X = self.vectorizer.transform(texts)
             
-            # Make prediction
-            pred = self.model.predict(X)[0]
-            prob = max(self.model.predict_proba(X)[0])
-            
-            # Convert prediction to readable format
-            prediction = "real" if pred == 1 else "fake"
+            # Make predictions; plain NumPy when the linear weights were exported
+            if self.weights is not None:
+                probs = predict_fast(X, *self.weights)
+            else:
+                probs = self.model.predict_proba(X)
+            preds = self.model.classes_[probs.argmax(axis=1)]
+            confidences = probs.max(axis=1)
+            fake_cols = np.flatnonzero(self.model.classes_ == 0)
+            if len(fake_cols):
+                high_risk = batch_flags(probs, int(fake_cols[0]))
+            else:
+                high_risk = np.zeros(len(texts), dtype=bool)
+            timestamp = datetime.now().isoformat()
             
-            return {
-                "prediction": prediction,
-                "confidence": float(prob),
-                "is_fake": pred == 0,
-                "is_real": pred == 1,
-                "threat_score": float(1 - pred) * prob,  # Higher if fake and confident
-                "timestamp": datetime.now().isoformat()
-            }
+            # Convert predictions to readable format
+            return [
+                {
+                    "prediction": "real" if pred == 1 else "fake",
+                    "confidence": float(prob),
+                    "is_fake": pred == 0,
+                    "is_real": pred == 1,
+                    "threat_score": float(1 - pred) * prob,  # Higher if fake and confident
+                    "is_high_risk": bool(flag),
+                    "timestamp": timestamp
+                }
+                for pred, prob, flag in zip(preds, confidences, high_risk)
+            ]
             
         except Exception as e:
             logger.error(f"Classification error: {e}")
-            return {
+            return [{
                 "error": str(e),
                 "prediction": "unknown",
                 "confidence": 0.0
-            }
+            } for _ in texts]
 
 # Global classifier instance
 _classifier = None
+_classifier_lock = threading.Lock()
 
 def get_classifier() -> ThreatClassifier:
     """Get global classifier instance"""
     global _classifier
     if _classifier is None:
-        _classifier = ThreatClassifier()
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = ThreatClassifier()
     return _classifier
 
+def reset_models():
+    """Drop cached models so the next classification reloads them (call after retraining)"""
+    global _classifier
+    with _classifier_lock:
+        _load_model_files.cache_clear()
+        _classifier = None
+
 def classify_text(text: str) -> Dict:
     """
     Convenience function for text classification
@@ -106,20 +175,37 @@ def classify_text(text: str) -> Dict:
     classifier = get_classifier()
     return classifier.classify_text(text)
 
-def is_high_risk_content(text: str, threshold: float = 0.7) -> bool:
+def classify_texts(texts: List[str]) -> List[Dict]:
     """
-    Check if content is high-risk fake news/misinformation
+    Convenience function for batched text classification
     
     Args:
-        text: Content to check
-        threshold: Confidence threshold for high-risk classification
+        texts: Contents to classify
         
     Returns:
-        True if content is high-risk
+        Classification results, one per text
     """
-    result = classify_text(text)
-    
+    classifier = get_classifier()
+    return classifier.classify_texts(texts)
+
+def is_high_risk_result(result: Dict, threshold: float = HIGH_RISK_THRESHOLD) -> bool:
+    """Whether a classification result is high-risk fake news/misinformation"""
     if "error" in result:
         return False
+    if threshold == HIGH_RISK_THRESHOLD and "is_high_risk" in result:
+        return result["is_high_risk"]
     
     return result["is_fake"] and result["confidence"] >= threshold
+
+def is_high_risk_content(text: str, threshold: float = HIGH_RISK_THRESHOLD) -> bool:
+    """
+    Check if content is high-risk fake news/misinformation
+    
+    Args:
+        text: Content to check
+        threshold: Confidence threshold for high-risk classification
+        
+    Returns:
+        True if content is high-risk
+    """
+    return is_high_risk_result(classify_text(text), threshold)
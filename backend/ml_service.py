@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import logging
+import threading
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -88,10 +89,11 @@ class ProtegoMLService:
         # ML Classification
         if self.ml_available:
             try:
-                from ml_classifier import classify_text, is_high_risk_content
+                from ml_classifier import classify_text, is_high_risk_result
                 
+                # One classification serves both the prediction and the high-risk flag
                 ml_result = classify_text(content)
-                high_risk = is_high_risk_content(content)
+                high_risk = is_high_risk_result(ml_result)
                 
                 result["ml_analysis"] = {
                     "prediction": ml_result.get("prediction", "unknown"),
@@ -174,12 +176,15 @@ class ProtegoMLService:
 
 # Global service instance
 _service = None
+_service_lock = threading.Lock()
 
 def get_ml_service() -> ProtegoMLService:
     """Get global ML service instance"""
     global _service
     if _service is None:
-        _service = ProtegoMLService()
+        with _service_lock:
+            if _service is None:
+                _service = ProtegoMLService()
     return _service
 
 def analyze_content(content: str, **metadata) -> Dict[str, Any]:
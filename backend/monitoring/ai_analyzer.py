@@ -3,21 +3,49 @@ AI-powered threat analysis and classification
 """
 import os
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime
 import asyncio
+import copy
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import joblib
+import numpy as np
 
 # ML and NLP imports
 try:
     from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-    from textblob import TextBlob
-    import numpy as np
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     logging.warning("Transformers not available, using fallback analysis")
 
+# Lexicon sentiment fallback
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:
+    VADER_AVAILABLE = False
+    logging.warning("VADER not available, sentiment fallback disabled")
+
+# JIT keyword scanning for long content
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Vectorized multi-pattern literal scanning
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 # Emergent integrations
 try:
     from emergentintegrations import EmergentIntegrations
@@ -28,22 +56,196 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '8192'))
+
+
+def _content_digest(content: str) -> bytes:
+    """Short fixed-size cache key for arbitrarily long content"""
+    return hashlib.blake2b((content or '').encode('utf-8'), digest_size=16).digest()
+
+
+# Context keywords that each add 0.1 to the basic threat score
+CONTEXT_BOOSTERS = (
+    ('personal_info', ('address', 'phone', 'home', 'family')),
+    ('urgency', ('now', 'today', 'tonight', 'soon')),
+    ('capability', ('have', 'will', 'going to', 'plan to')),
+)
+
+# Lower bounds of each severity band above 'minimal'
+SEVERITY_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+SEVERITY_LABELS = ('minimal', 'low', 'medium', 'high', 'critical')
+
+# Static LLM instructions, sent as a system message so providers can cache them
+LLM_SYSTEM_PROMPT = """Analyze the user-supplied content for potential threats against the named public figure on the given platform.
+
+Please provide:
+1. Threat level (0-10 where 10 is most severe)
+2. Threat type (physical, harassment, doxxing, misinformation, impersonation, reputation_damage)
+3. Specific concerns or red flags
+4. Recommended action (monitor, investigate, alert authorities, etc.)
+
+Respond in JSON format with keys: threat_level, threat_type, concerns, recommended_action"""
+
+# Weights for basic, sentiment, AI classification and LLM scores
+ANALYSIS_WEIGHTS = np.array([0.4, 0.2, 0.25, 0.15], dtype=np.float64)
+
+# Content shorter than this is scanned with str.__contains__, which beats the
+# JIT loop once call overhead is counted
+NUMBA_SCAN_MIN_LENGTH = int(os.getenv('NUMBA_SCAN_MIN_LENGTH', '4096'))
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _keyword_hits(content, kw_bytes, offsets):
+        """Flag which packed keywords occur in the UTF-8 content bytes"""
+        n_kw = len(offsets) - 1
+        hits = np.zeros(n_kw, np.bool_)
+        n = len(content)
+        for k in range(n_kw):
+            start = offsets[k]
+            m = offsets[k + 1] - start
+            first = kw_bytes[start]
+            for i in range(n - m + 1):
+                if content[i] != first:
+                    continue
+                j = 1
+                while j < m and content[i + j] == kw_bytes[start + j]:
+                    j += 1
+                if j == m:
+                    hits[k] = True
+                    break
+        return hits
+
+
+class _KeywordIndex:
+    """Flattened threat keywords packed into one byte buffer plus offsets.
+
+    Matching uses a compiled Hyperscan database when available, the Numba
+    kernel for long content, and plain substring checks otherwise.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.keywords: List[str] = []
+        self.categories: List[str] = []
+        for category, keywords in patterns.items():
+            self.keywords.extend(keywords)
+            self.categories.extend([category] * len(keywords))
+        encoded = [kw.encode('utf-8') for kw in self.keywords]
+        self.kw_bytes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(kw) for kw in encoded])
+        self.database = self._compile_database(encoded) if HYPERSCAN_AVAILABLE else None
+
+    @staticmethod
+    def _compile_database(encoded: List[bytes]):
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(kw) for kw in encoded],
+                ids=list(range(len(encoded))),
+                elements=len(encoded),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(encoded)
+            )
+            return database
+        except Exception as e:
+            logger.warning(f"Hyperscan keyword database compile failed: {e}")
+            return None
+
+    def match(self, content_lower: str) -> List[int]:
+        """Indices of keywords found in already-lowercased content, in pattern order"""
+        if self.database is not None:
+            found: List[int] = []
+            self.database.scan(
+                content_lower.encode('utf-8'),
+                match_event_handler=lambda kw_id, start, end, flags, ctx: found.append(kw_id)
+            )
+            return sorted(found)
+        if NUMBA_AVAILABLE and len(content_lower) >= NUMBA_SCAN_MIN_LENGTH:
+            content_bytes = np.frombuffer(content_lower.encode('utf-8'), dtype=np.uint8)
+            return np.flatnonzero(_keyword_hits(content_bytes, self.kw_bytes, self.offsets)).tolist()
+        return [i for i, kw in enumerate(self.keywords) if kw in content_lower]
+
+
+class _AnalysisCache:
+    """Small LRU for analysis results keyed by content digest.
+
+    Async lookups are single-flight: concurrent misses for the same key wait
+    on one computation instead of each running the model. A computation that
+    raises is not cached. Values are deep-copied in and out so callers never
+    share the cached lists.
+    """
+
+    def __init__(self, maxsize: int = ANALYSIS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._locks: Dict[Any, asyncio.Lock] = {}
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        value = self._data.get(key)
+        if value is None:
+            return None
+        self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: Any, value: Dict[str, Any]) -> Dict[str, Any]:
+        self._data[key] = copy.deepcopy(value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    async def get_or_compute(self, key: Any, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+                return self.put(key, await factory())
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+
 class AIThreatAnalyzer:
     """AI-powered threat analysis and classification"""
+
+    # Shared spaCy pipeline; False once loading has failed
+    _spacy_nlp = None
     
     def __init__(self):
         self.sentiment_analyzer = None
         self.threat_classifier = None
+        self._vader = None
         self.emergent_client = None
         self.custom_model = None
         self.baseline_model = None
         self.vectorizer = None
         self.keyword_patterns = self._load_threat_patterns()
+        self._keyword_index = _KeywordIndex(self.keyword_patterns)
+        # One scan over all booster keywords; each booster type owns one bit
+        self._booster_index = _KeywordIndex(dict(CONTEXT_BOOSTERS))
+        booster_ids = {booster_type: i for i, (booster_type, _) in enumerate(CONTEXT_BOOSTERS)}
+        self._booster_bits = [1 << booster_ids[cat] for cat in self._booster_index.categories]
+        self._basic_cache = _AnalysisCache()
+        self._sentiment_cache = _AnalysisCache()
+        self._classification_cache = _AnalysisCache()
+        self._enrichment_cache = _AnalysisCache()
+        # One worker per pipeline: torch releases the GIL during inference, so
+        # the event loop keeps serving while a forward pass runs
+        self._sentiment_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+        self._classifier_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classifier")
         self._initialize_models()
         
     def _initialize_models(self):
         """Initialize AI models"""
         try:
+            # Lexicon-based sentiment used when transformers are unavailable
+            if VADER_AVAILABLE:
+                self._vader = SentimentIntensityAnalyzer()
+
             if TRANSFORMERS_AVAILABLE:
                 # Initialize sentiment analysis
                 self.sentiment_analyzer = pipeline(
@@ -57,6 +259,7 @@ class AIThreatAnalyzer:
                     model="unitary/toxic-bert"
                 )
                 
+                self._warm_up_pipelines()
                 logger.info("AI models initialized successfully")
             
             # Initialize Emergent client if available
@@ -93,6 +296,24 @@ class AIThreatAnalyzer:
         except Exception as e:
             logger.error(f"Error initializing AI models: {e}")
             
+    def _warm_up_pipelines(self):
+        """Run a few dummy passes so the first real request doesn't pay cold-start cost"""
+        try:
+            import torch
+            torch.set_num_threads(min(4, os.cpu_count() or 1))
+            torch.set_num_interop_threads(1)
+            if torch.cuda.is_available():
+                torch.backends.cudnn.benchmark = True
+        except Exception as e:
+            logger.debug(f"Torch thread configuration skipped: {e}")
+
+        try:
+            for _ in range(3):
+                self.sentiment_analyzer("warmup", truncation=True)
+                self.threat_classifier("warmup", truncation=True)
+        except Exception as e:
+            logger.warning(f"Pipeline warm-up failed: {e}")
+
     def _load_threat_patterns(self) -> Dict[str, List[str]]:
         """Load threat detection patterns"""
         return {
@@ -130,14 +351,22 @@ class AIThreatAnalyzer:
             # Basic analysis
             basic_analysis = self._basic_threat_analysis(content, vip_name)
             
-            # Sentiment analysis
-            sentiment_analysis = await self._analyze_sentiment(content)
-            
-            # AI classification
-            ai_classification = await self._classify_with_ai(content, vip_name)
-            
-            # Advanced LLM analysis (if available)
-            llm_analysis = await self._analyze_with_llm(content, vip_name, platform)
+            # Sentiment, AI classification and LLM analysis are independent
+            sentiment_analysis, ai_classification, llm_analysis = await asyncio.gather(
+                self._analyze_sentiment(content),
+                self._classify_with_ai(content, vip_name),
+                self._analyze_with_llm(content, vip_name, platform),
+                return_exceptions=True
+            )
+            if isinstance(sentiment_analysis, Exception):
+                logger.error(f"Error in sentiment analysis: {sentiment_analysis}")
+                sentiment_analysis = {'sentiment': 'unknown', 'confidence': 0.0, 'threat_relevance': 0.3}
+            if isinstance(ai_classification, Exception):
+                logger.error(f"Error in AI classification: {ai_classification}")
+                ai_classification = {'toxicity_score': 0.3, 'is_toxic': False, 'model_confidence': 0.0}
+            if isinstance(llm_analysis, Exception):
+                logger.error(f"Error in LLM analysis: {llm_analysis}")
+                llm_analysis = {'llm_analysis': None}
             
             # Combine all analyses
             final_analysis = self._combine_analyses(
@@ -151,7 +380,14 @@ class AIThreatAnalyzer:
             return self._fallback_analysis(content, vip_name)
     
     def _basic_threat_analysis(self, content: str, vip_name: str) -> Dict[str, Any]:
-        """Basic keyword-based threat analysis"""
+        """Basic keyword-based threat analysis (cached per content and VIP)"""
+        key = (_content_digest(content), vip_name.lower())
+        cached = self._basic_cache.get(key)
+        if cached is not None:
+            return cached
+        return self._basic_cache.put(key, self._compute_basic_threat_analysis(content, vip_name))
+
+    def _compute_basic_threat_analysis(self, content: str, vip_name: str) -> Dict[str, Any]:
         content_lower = content.lower()
         vip_lower = vip_name.lower()
         
@@ -170,26 +406,25 @@ class AIThreatAnalyzer:
         threat_indicators = []
         threat_scores = {}
         
-        for threat_type, keywords in self.keyword_patterns.items():
-            matches = [kw for kw in keywords if kw in content_lower]
-            if matches:
-                threat_indicators.extend(matches)
-                threat_scores[threat_type] = len(matches) / len(keywords)
+        index = self._keyword_index
+        for i in index.match(content_lower):
+            threat_type = index.categories[i]
+            threat_indicators.append(index.keywords[i])
+            threat_scores[threat_type] = threat_scores.get(threat_type, 0) + 1
+        for threat_type, count in threat_scores.items():
+            threat_scores[threat_type] = count / len(self.keyword_patterns[threat_type])
         
         # Calculate overall threat score
         max_score = max(threat_scores.values(), default=0.0)
         threat_type = max(threat_scores, key=threat_scores.get) if threat_scores else 'harassment'
         
         # Boost score based on context
-        context_boosters = {
-            'personal_info': ['address', 'phone', 'home', 'family'],
-            'urgency': ['now', 'today', 'tonight', 'soon'],
-            'capability': ['have', 'will', 'going to', 'plan to']
-        }
-        
-        for booster_type, keywords in context_boosters.items():
-            if any(kw in content_lower for kw in keywords):
-                max_score += 0.1
+        present = 0
+        for i in self._booster_index.match(content_lower):
+            present |= self._booster_bits[i]
+        # Repeated adds keep the float results identical to the per-booster loop
+        for _ in range(present.bit_count()):
+            max_score += 0.1
         
         return {
             'threat_score': min(max_score, 1.0),
@@ -229,133 +464,176 @@ class AIThreatAnalyzer:
 
         return flags
     
+    async def enrich_threat_evidence(self, content: str, vip_name: str) -> Dict[str, Any]:
+        """Misinformation/impersonation flags, sentiment and entities (cached per content and VIP)"""
+        try:
+            return await self._enrichment_cache.get_or_compute(
+                (_content_digest(content), vip_name.lower()),
+                lambda: self._compute_enrichment(content, vip_name)
+            )
+        except Exception as e:
+            logger.error(f"Error in evidence enrichment: {e}")
+            return {'flags': self._detect_misinfo_impersonation(content, vip_name)}
+
+    async def _compute_enrichment(self, content: str, vip_name: str) -> Dict[str, Any]:
+        return {
+            'flags': self._detect_misinfo_impersonation(content, vip_name),
+            'sentiment': await self._sentiment_cache.get_or_compute(
+                _content_digest(content), lambda: self._compute_sentiment(content)
+            ),
+            'entities': self._extract_entities(content)[:10]
+        }
+
+    @classmethod
+    def _get_spacy_nlp(cls):
+        """Load the spaCy NER pipeline once; None if spaCy or the model is missing."""
+        if cls._spacy_nlp is None:
+            try:
+                import spacy
+                cls._spacy_nlp = spacy.load(
+                    "en_core_web_sm",
+                    disable=["parser", "tagger", "lemmatizer", "attribute_ruler"]
+                )
+            except (ImportError, OSError):
+                cls._spacy_nlp = False
+        return cls._spacy_nlp or None
+
     def _extract_entities(self, content: str) -> List[Dict[str, Any]]:
         """Basic NER using spaCy if available; otherwise empty."""
         try:
-            import spacy
-            try:
-                nlp = spacy.load("en_core_web_sm")
-            except OSError:
+            nlp = self._get_spacy_nlp()
+            if nlp is None:
                 return []
             doc = nlp(content or "")
             return [{"text": ent.text, "label": ent.label_} for ent in doc.ents[:20]]
         except Exception:
             return []
 
+    async def _run_blocking(self, executor: ThreadPoolExecutor, func: Callable, *args, **kwargs) -> Any:
+        """Run a synchronous model call on its executor without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
     async def _analyze_sentiment(self, content: str) -> Dict[str, Any]:
-        """Analyze sentiment using AI models"""
+        """Analyze sentiment using AI models (cached per content; errors are not cached)"""
         try:
-            if self.sentiment_analyzer:
-                result = self.sentiment_analyzer(content[:512])  # Limit token length
-                sentiment = result[0]['label'].lower()
-                confidence = result[0]['score']
-                
-                # Convert sentiment to threat relevance
-                threat_relevance = 0.0
-                if sentiment == 'negative':
-                    threat_relevance = confidence * 0.5
-                elif sentiment == 'neutral':
-                    threat_relevance = 0.2
-                
-                return {
-                    'sentiment': sentiment,
-                    'confidence': confidence,
-                    'threat_relevance': threat_relevance
-                }
-            else:
-                # Fallback to TextBlob
-                blob = TextBlob(content)
-                polarity = blob.sentiment.polarity
-                
-                if polarity < -0.3:
-                    sentiment = 'negative'
-                    threat_relevance = abs(polarity) * 0.5
-                elif polarity > 0.3:
-                    sentiment = 'positive'
-                    threat_relevance = 0.1
-                else:
-                    sentiment = 'neutral'
-                    threat_relevance = 0.2
-                
-                return {
-                    'sentiment': sentiment,
-                    'confidence': abs(polarity),
-                    'threat_relevance': threat_relevance
-                }
-                
+            return await self._sentiment_cache.get_or_compute(
+                _content_digest(content), lambda: self._compute_sentiment(content)
+            )
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {e}")
             return {'sentiment': 'unknown', 'confidence': 0.0, 'threat_relevance': 0.3}
-    
-    async def _classify_with_ai(self, content: str, vip_name: str) -> Dict[str, Any]:
-        """Classify content using AI models"""
-        try:
-            # Prefer baseline TF-IDF model if available
-            if self.baseline_model and self.vectorizer:
-                text_tfidf = self.vectorizer.transform([content])
-                prediction = self.baseline_model.predict(text_tfidf)[0]
-                confidence = max(self.baseline_model.predict_proba(text_tfidf)[0])
-                
-                return {
-                    'fake_news_score': 1 - prediction,  # 0 = fake, 1 = real
-                    'is_fake': prediction == 0,
-                    'is_real': prediction == 1,
-                    'model_confidence': confidence,
-                    'model_type': 'baseline_tfidf',
-                    'threat_relevance': (1 - prediction) * confidence  # Higher if fake and confident
-                }
+
+    async def _compute_sentiment(self, content: str) -> Dict[str, Any]:
+        if self.sentiment_analyzer:
+            result = await self._run_blocking(
+                self._sentiment_executor, self.sentiment_analyzer, content,
+                truncation=True, max_length=512, padding=False  # Limit token length
+            )
+            sentiment = result[0]['label'].lower()
+            confidence = result[0]['score']
             
-            # Use custom model if available
-            if self.custom_model:
-                pred = self.custom_model.predict([content[:1000]])[0]
-                return {
-                    'toxicity_score': pred.probabilities_by_label.get('toxic', pred.probability),
-                    'is_toxic': pred.label.lower() == 'toxic',
-                    'model_confidence': pred.probability,
-                    'model_label': pred.label,
-                    'model_type': 'custom_sklearn'
-                }
+            # Convert sentiment to threat relevance
+            threat_relevance = 0.0
+            if sentiment == 'negative':
+                threat_relevance = confidence * 0.5
+            elif sentiment == 'neutral':
+                threat_relevance = 0.2
             
-            # Fallback to transformer model
-            if self.threat_classifier:
-                result = self.threat_classifier(content[:512])
-                toxicity_score = result[0]['score'] if result[0]['label'] == 'TOXIC' else 1 - result[0]['score']
-                
-                return {
-                    'toxicity_score': toxicity_score,
-                    'is_toxic': toxicity_score > 0.5,
-                    'model_confidence': result[0]['score'],
-                    'model_type': 'transformers'
-                }
+            return {
+                'sentiment': sentiment,
+                'confidence': confidence,
+                'threat_relevance': threat_relevance
+            }
+        elif self._vader:
+            # Fallback to VADER lexicon scoring
+            polarity = self._vader.polarity_scores(content)['compound']
+            
+            if polarity < -0.3:
+                sentiment = 'negative'
+                threat_relevance = abs(polarity) * 0.5
+            elif polarity > 0.3:
+                sentiment = 'positive'
+                threat_relevance = 0.1
             else:
-                return {'toxicity_score': 0.3, 'is_toxic': False, 'model_confidence': 0.0, 'model_type': 'fallback'}
-                
+                sentiment = 'neutral'
+                threat_relevance = 0.2
+            
+            return {
+                'sentiment': sentiment,
+                'confidence': abs(polarity),
+                'threat_relevance': threat_relevance
+            }
+        else:
+            return {'sentiment': 'neutral', 'confidence': 0.0, 'threat_relevance': 0.2}
+
+    async def _classify_with_ai(self, content: str, vip_name: str) -> Dict[str, Any]:
+        """Classify content using AI models (cached per content; errors are not cached)"""
+        try:
+            return await self._classification_cache.get_or_compute(
+                _content_digest(content), lambda: self._compute_classification(content)
+            )
         except Exception as e:
             logger.error(f"Error in AI classification: {e}")
             return {'toxicity_score': 0.3, 'is_toxic': False, 'model_confidence': 0.0}
-    
+
+    async def _compute_classification(self, content: str) -> Dict[str, Any]:
+        # Prefer baseline TF-IDF model if available
+        if self.baseline_model and self.vectorizer:
+            text_tfidf = self.vectorizer.transform([content])
+            prediction = self.baseline_model.predict(text_tfidf)[0]
+            confidence = max(self.baseline_model.predict_proba(text_tfidf)[0])
+            
+            return {
+                'fake_news_score': 1 - prediction,  # 0 = fake, 1 = real
+                'is_fake': prediction == 0,
+                'is_real': prediction == 1,
+                'model_confidence': confidence,
+                'model_type': 'baseline_tfidf',
+                'threat_relevance': (1 - prediction) * confidence  # Higher if fake and confident
+            }
+        
+        # Use custom model if available
+        if self.custom_model:
+            pred = self.custom_model.predict([content[:1000]])[0]
+            return {
+                'toxicity_score': pred.probabilities_by_label.get('toxic', pred.probability),
+                'is_toxic': pred.label.lower() == 'toxic',
+                'model_confidence': pred.probability,
+                'model_label': pred.label,
+                'model_type': 'custom_sklearn'
+            }
+        
+        # Fallback to transformer model
+        if self.threat_classifier:
+            result = await self._run_blocking(
+                self._classifier_executor, self.threat_classifier, content,
+                truncation=True, max_length=512, padding=False
+            )
+            toxicity_score = result[0]['score'] if result[0]['label'] == 'TOXIC' else 1 - result[0]['score']
+            
+            return {
+                'toxicity_score': toxicity_score,
+                'is_toxic': toxicity_score > 0.5,
+                'model_confidence': result[0]['score'],
+                'model_type': 'transformers'
+            }
+        else:
+            return {'toxicity_score': 0.3, 'is_toxic': False, 'model_confidence': 0.0, 'model_type': 'fallback'}
+
     async def _analyze_with_llm(self, content: str, vip_name: str, platform: str) -> Dict[str, Any]:
         """Advanced analysis using LLM"""
         try:
             if not self.emergent_client:
                 return {'llm_analysis': None}
             
-            prompt = f"""
-            Analyze the following content for potential threats against the public figure "{vip_name}" on {platform}:
-            
-            Content: "{content[:1000]}"
-            
-            Please provide:
-            1. Threat level (0-10 where 10 is most severe)
-            2. Threat type (physical, harassment, doxxing, misinformation, impersonation, reputation_damage)
-            3. Specific concerns or red flags
-            4. Recommended action (monitor, investigate, alert authorities, etc.)
-            
-            Respond in JSON format with keys: threat_level, threat_type, concerns, recommended_action
-            """
+            user_message = f'VIP="{vip_name}" Platform={platform}\nContent: "{content[:1000]}"'
             
             response = await self.emergent_client.chat_completion(
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": LLM_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message}
+                ],
                 model="gpt-3.5-turbo",
                 temperature=0.1
             )
@@ -377,42 +655,29 @@ class AIThreatAnalyzer:
     def _combine_analyses(self, basic: Dict, sentiment: Dict, ai: Dict, llm: Dict) -> Dict[str, Any]:
         """Combine all analysis results into final assessment"""
         
-        # Calculate weighted threat score
-        scores = []
-        weights = []
-        
-        # Basic analysis (40% weight)
-        if basic['threat_score'] > 0:
-            scores.append(basic['threat_score'])
-            weights.append(0.4)
-        
-        # Sentiment analysis (20% weight)
-        if sentiment['threat_relevance'] > 0:
-            scores.append(sentiment['threat_relevance'])
-            weights.append(0.2)
-        
-        # AI classification (25% weight) - handle both fake news and toxicity
+        # Calculate weighted threat score: basic 40%, sentiment 20%,
+        # AI classification 25%, LLM 15%; non-positive signals are skipped
+        # AI classification - handle both fake news and toxicity
         ai_score = 0
         if 'fake_news_score' in ai and ai['fake_news_score'] > 0:
             ai_score = ai['fake_news_score']
         elif 'toxicity_score' in ai and ai['toxicity_score'] > 0:
             ai_score = ai['toxicity_score']
         
-        if ai_score > 0:
-            scores.append(ai_score)
-            weights.append(0.25)
-        
-        # LLM analysis (15% weight)
+        llm_score = 0
         if llm.get('llm_analysis') and isinstance(llm['llm_analysis'], dict):
             llm_score = llm['llm_analysis'].get('threat_level', 0) / 10.0
-            if llm_score > 0:
-                scores.append(llm_score)
-                weights.append(0.15)
+        
+        scores = np.array(
+            [basic['threat_score'], sentiment['threat_relevance'], ai_score, llm_score],
+            dtype=np.float64
+        )
+        mask = scores > 0
         
         # Calculate weighted average
-        if scores and weights:
-            total_weight = sum(weights)
-            weighted_score = sum(s * w for s, w in zip(scores, weights)) / total_weight
+        if mask.any():
+            weights = ANALYSIS_WEIGHTS * mask
+            weighted_score = float(scores @ weights / weights.sum())
         else:
             weighted_score = basic['threat_score']
         
@@ -440,16 +705,7 @@ class AIThreatAnalyzer:
     
     def _calculate_severity(self, score: float) -> str:
         """Calculate threat severity"""
-        if score >= 0.8:
-            return 'critical'
-        elif score >= 0.6:
-            return 'high'
-        elif score >= 0.4:
-            return 'medium'
-        elif score >= 0.2:
-            return 'low'
-        else:
-            return 'minimal'
+        return SEVERITY_LABELS[bisect_right(SEVERITY_THRESHOLDS, score)]
     
     def _calculate_confidence(self, basic: Dict, sentiment: Dict, ai: Dict, llm: Dict) -> float:
         """Calculate overall confidence in the analysis"""
@@ -511,7 +767,8 @@ class AIThreatAnalyzer:
         if threat_type in threat_specific:
             recommendations.extend(threat_specific[threat_type])
         
-        return list(set(recommendations))  # Remove duplicates
+        # Base and threat-specific recommendations never overlap, so order is kept as built
+        return recommendations
     
     def _fallback_analysis(self, content: str, vip_name: str) -> Dict[str, Any]:
         """Fallback analysis when AI models fail"""
@@ -1,21 +1,42 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Tuple, Optional, Dict, Any
 
 import joblib
+import numpy as np
 from sklearn.pipeline import Pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
 
 
 DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "threat_model.joblib")
 
 
+# path -> (mtime_ns, artifact); a retrained file has a new mtime and is reloaded
+_ARTIFACTS: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def _load_artifact(path: str) -> Dict[str, Any]:
+    # Memory-map the arrays so forked workers share pages, and load each file version once per process
+    mtime = os.stat(path).st_mtime_ns
+    cached = _ARTIFACTS.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _ARTIFACTS[path] = (mtime, joblib.load(path, mmap_mode="r"))
+    return cached[1]
+
+
 @dataclass
 class ThreatPrediction:
     label: str
     probability: float
-    probabilities_by_label: Dict[str, float]
+    _probs: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), repr=False)
+    _labels: Tuple[str, ...] = field(default=(), repr=False)
+
+    @cached_property
+    def probabilities_by_label(self) -> Dict[str, float]:
+        # Built only when a caller actually needs the full distribution
+        return dict(zip(self._labels, self._probs.tolist()))
 
 
 class ThreatModel:
@@ -25,6 +46,7 @@ class ThreatModel:
         self.model_path = model_path
         self.pipeline: Optional[Pipeline] = None
         self.labels: List[str] = []
+        self.quantized: Optional[Dict[str, np.ndarray]] = None
 
     def is_available(self) -> bool:
         return os.path.exists(self.model_path)
@@ -32,50 +54,80 @@ class ThreatModel:
     def load(self) -> bool:
         if not self.is_available():
             return False
-        obj = joblib.load(self.model_path)
+        obj = _load_artifact(self.model_path)
         self.pipeline = obj["pipeline"]
         self.labels = obj["labels"]
+        self.quantized = obj.get("quantized")
         return True
 
     def predict(self, texts: List[str]) -> List[ThreatPrediction]:
         if not self.pipeline:
             raise RuntimeError("ThreatModel not loaded")
         probs = self._predict_proba(texts)
-        preds: List[ThreatPrediction] = []
-        for p in probs:
-            best_idx = int(max(range(len(p)), key=lambda i: p[i]))
-            best_label = self.labels[best_idx]
-            proba_map = {self.labels[i]: float(p[i]) for i in range(len(self.labels))}
-            preds.append(ThreatPrediction(label=best_label, probability=float(p[best_idx]), probabilities_by_label=proba_map))
-        return preds
+        best_idx = probs.argmax(axis=1)
+        best_prob = probs[np.arange(len(probs)), best_idx]
+        best_labels = np.asarray(self.labels, dtype=object)[best_idx]
+        labels = tuple(self.labels)
+        return [
+            ThreatPrediction(label=best_labels[i], probability=float(best_prob[i]), _probs=probs[i], _labels=labels)
+            for i in range(len(probs))
+        ]
 
     def _predict_proba(self, texts: List[str]):
-        # LogisticRegression has predict_proba
-        return self.pipeline.predict_proba(texts)
-
-
-def build_default_pipeline(C: float = 2.0, max_features: int = 50000) -> Pipeline:
+        if self.quantized is None:
+            # SGDClassifier with log_loss has predict_proba
+            return np.asarray(self.pipeline.predict_proba(texts)).astype(np.float32, copy=False)
+        # int8 coefficients with per-class scales; mirrors the one-vs-rest
+        # logistic probabilities sklearn computes for linear classifiers
+        X = self.pipeline[:-1].transform(texts)
+        q = self.quantized
+        scores = np.asarray(X @ q["coef"].T, dtype=np.float32) * q["scale"] + q["intercept"]
+        prob = 1.0 / (1.0 + np.exp(-scores))
+        if prob.shape[1] == 1:
+            return np.hstack([1.0 - prob, prob]).astype(np.float32, copy=False)
+        return (prob / prob.sum(axis=1, keepdims=True)).astype(np.float32, copy=False)
+
+
+def build_default_pipeline(alpha: float = 1e-5, n_features: int = 2 ** 18) -> Pipeline:
+    # Stateless hashing keeps the saved model free of a vocabulary/IDF table
+    # and lets the classifier be updated incrementally with partial_fit.
     return Pipeline([
-        ("tfidf", TfidfVectorizer(
+        ("hv", HashingVectorizer(
             lowercase=True,
             ngram_range=(1, 2),
-            max_features=max_features,
-            min_df=2,
-            strip_accents="unicode"
+            n_features=n_features,
+            alternate_sign=False,
+            norm="l2",
+            strip_accents="unicode",
+            dtype=np.float32
         )),
-        ("clf", LogisticRegression(
-            C=C,
-            max_iter=200,
-            n_jobs=None,
-            solver="liblinear",
-            class_weight="balanced"
+        ("clf", SGDClassifier(
+            loss="log_loss",
+            alpha=alpha,
+            n_jobs=-1,
+            class_weight="balanced",
+            random_state=42
         ))
     ])
 
 
-def save_model(pipeline: Pipeline, labels: List[str], path: str = DEFAULT_MODEL_PATH) -> str:
+def quantize_classifier(pipeline: Pipeline) -> Dict[str, np.ndarray]:
+    """Cast the linear classifier to float32 and build int8 per-class coefficients."""
+    clf = pipeline.steps[-1][1]
+    clf.coef_ = clf.coef_.astype(np.float32)
+    clf.intercept_ = clf.intercept_.astype(np.float32)
+    scale = np.abs(clf.coef_).max(axis=1) / 127.0
+    scale[scale == 0] = 1.0
+    coef_q = np.round(clf.coef_ / scale[:, None]).astype(np.int8)
+    return {"coef": coef_q, "scale": scale.astype(np.float32), "intercept": clf.intercept_}
+
+
+def save_model(pipeline: Pipeline, labels: List[str], path: str = DEFAULT_MODEL_PATH, quantize: bool = True) -> str:
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    joblib.dump({"pipeline": pipeline, "labels": labels}, path)
+    obj: Dict[str, Any] = {"pipeline": pipeline, "labels": labels}
+    if quantize:
+        obj["quantized"] = quantize_classifier(pipeline)
+    joblib.dump(obj, path)
     return path
 
 
@@ -4,38 +4,282 @@ Platform monitoring modules for VIP threat detection
 import asyncio
 import logging
 import os
+import re
+import threading
+from bisect import bisect_right
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Optional, Set, Tuple
 import aiohttp
-import praw
-from newsapi import NewsApiClient
-from googleapiclient.discovery import build
+import asyncpraw
 import requests
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
+from cachetools import LRUCache, TTLCache
+
+# Single-pass multi-keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# SIMD multi-pattern matching, preferred over Aho-Corasick when installed
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# JIT-compiled scoring arithmetic
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Non-blocking DNS for the shared connector instead of the thread-pool resolver
+try:
+    import aiodns  # noqa: F401
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Search responses keyed by (query, day); repeated cycles within the TTL skip the API
+API_CACHE_TTL_SECONDS = int(os.getenv('API_CACHE_TTL_SECONDS', '900'))
+_NEWS_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=API_CACHE_TTL_SECONDS)
+_YOUTUBE_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=API_CACHE_TTL_SECONDS)
+
+# Hot-listing comments shared across VIPs so each cycle fetches and lowercases them once
+REDDIT_HOT_CACHE_TTL_SECONDS = int(os.getenv('REDDIT_HOT_CACHE_TTL_SECONDS', '300'))
+_REDDIT_HOT_CACHE: TTLCache = TTLCache(maxsize=1, ttl=REDDIT_HOT_CACHE_TTL_SECONDS)
+REDDIT_COMMENT_LIMIT = int(os.getenv('REDDIT_COMMENT_LIMIT', '50'))
+
+# Assessments of identical content (reposts, pinned threads, repeated articles) keyed by
+# (monitor class, content hash, VIP); the lock covers callers running in worker threads
+ASSESS_CACHE_SIZE = int(os.getenv('ASSESS_CACHE_SIZE', '100000'))
+_ASSESS_CACHE: LRUCache = LRUCache(maxsize=ASSESS_CACHE_SIZE)
+_ASSESS_CACHE_LOCK = threading.Lock()
+
+# One connection pool, DNS cache and TLS session cache shared by every monitor
+_SHARED_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+# Comma-separated nameservers for the async resolver; empty uses the system configuration
+DNS_NAMESERVERS = [ns.strip() for ns in os.getenv('DNS_NAMESERVERS', '').split(',') if ns.strip()]
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Shared HTTP session, created on first use"""
+    global _SHARED_SESSION
+    async with _SESSION_LOCK:
+        if _SHARED_SESSION is None or _SHARED_SESSION.closed:
+            resolver = None
+            if AIODNS_AVAILABLE:
+                resolver = aiohttp.AsyncResolver(nameservers=DNS_NAMESERVERS or None)
+            _SHARED_SESSION = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=16,
+                    use_dns_cache=True, ttl_dns_cache=300, resolver=resolver
+                ),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return _SHARED_SESSION
+
+
+async def close_http_session():
+    """Close the shared HTTP session on shutdown"""
+    global _SHARED_SESSION
+    async with _SESSION_LOCK:
+        if _SHARED_SESSION is not None and not _SHARED_SESSION.closed:
+            await _SHARED_SESSION.close()
+        _SHARED_SESSION = None
+
+
+class _KeywordScanner:
+    """Tagged keyword vocabulary matched in one pass over lowercased content"""
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = {tag: tuple(words) for tag, words in groups.items()}
+        self._tags: Dict[str, List[str]] = {}
+        for tag, words in self.groups.items():
+            for word in words:
+                self._tags.setdefault(word, []).append(tag)
+        self._words = list(self._tags)
+        self._database = self._compile_database(self._words) if HYPERSCAN_AVAILABLE and self._words else None
+        self._automaton = None
+        if self._database is None and AHOCORASICK_AVAILABLE and self._words:
+            automaton = ahocorasick.Automaton()
+            for word in self._tags:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    @staticmethod
+    def _compile_database(words: List[str]):
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(word).encode('utf-8') for word in words],
+                ids=list(range(len(words))),
+                elements=len(words),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(words)
+            )
+            return database
+        except Exception as e:
+            logger.warning(f"Hyperscan keyword database compile failed: {e}")
+            return None
+
+    def matches(self, content_lower: str) -> Set[str]:
+        """Distinct vocabulary words occurring in the content"""
+        if self._database is not None:
+            found: Set[str] = set()
+            self._database.scan(
+                content_lower.encode('utf-8'),
+                match_event_handler=lambda word_id, start, end, flags, ctx: found.add(self._words[word_id])
+            )
+            return found
+        if self._automaton is not None:
+            return {word for _, word in self._automaton.iter(content_lower)}
+        return {word for word in self._tags if word in content_lower}
+
+    def mentions(self, content_lower: str) -> bool:
+        """Whether any vocabulary word occurs in the content"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(content_lower), None) is not None
+        if self._database is not None:
+            return bool(self.matches(content_lower))
+        return any(word in content_lower for word in self._words)
+
+    def counts(self, content_lower: str) -> Dict[str, int]:
+        """Number of distinct words matched per tag"""
+        counts = dict.fromkeys(self.groups, 0)
+        for word in self.matches(content_lower):
+            for tag in self._tags[word]:
+                counts[tag] += 1
+        return counts
+
+
+def _reddit_threat_score(threat_n: int, personal_n: int, urgency_n: int) -> float:
+    """Reddit threat score from keyword counts, for content that mentions the VIP"""
+    score = 0.3
+    score += min(threat_n * 0.2, 0.6)
+    score += min(personal_n * 0.15, 0.3)
+    score += min(urgency_n * 0.1, 0.2)
+    return min(score, 1.0)
+
+
+if NUMBA_AVAILABLE:
+    _reddit_threat_score = njit(cache=True)(_reddit_threat_score)
+    _reddit_threat_score(0, 0, 0)  # compile at import, not on the first scan
+
+
+@lru_cache(maxsize=1024)
+def _vip_scanner(vip_name: str, keywords: Tuple[str, ...]) -> _KeywordScanner:
+    """Scanner for a VIP's name and keywords, reused across monitoring cycles"""
+    return _KeywordScanner({'vip': [term.lower() for term in (vip_name,) + keywords if term]})
+
+
 class BasePlatformMonitor:
     """Base class for platform monitors"""
+
+    # Lower bounds of each severity band above the first label
+    SEVERITY_THRESHOLDS = (0.6, 0.8)
+    SEVERITY_LABELS = ('low', 'medium', 'high')
+
+    # Whether monitor_batch covers several VIPs with fewer API calls than monitor_vip
+    supports_batch = False
+
+    # Scanner tags checked in priority order; the first with a hit is the threat type
+    THREAT_TYPES: Tuple[str, ...] = ()
+    DEFAULT_THREAT_TYPE = 'unknown'
+    _scanner: _KeywordScanner
     
     def __init__(self, platform_name: str):
         self.platform_name = platform_name
         self.is_enabled = False
+        # Headers sent with every request this monitor makes on the shared session
+        self._session_headers: Dict[str, str] = {}
         
     async def monitor_vip(self, vip_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Monitor a VIP on this platform"""
         raise NotImplementedError
+
+    async def monitor_batch(self, vip_profiles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Monitor several VIPs; returns one threat list per profile"""
+        return [await self.monitor_vip(vip) for vip in vip_profiles]
         
     def is_api_configured(self) -> bool:
         """Check if API credentials are configured"""
         raise NotImplementedError
 
+    def _assess_threat(self, content: str, vip_name: str, content_lower: Optional[str] = None) -> Tuple[float, str, str]:
+        """Threat score, type and severity from a single keyword scan of the content"""
+        if not content:
+            return 0.0, self.DEFAULT_THREAT_TYPE, self._calculate_severity(0.0)
+        if content_lower is None:
+            content_lower = content.lower()
+        key = (type(self), hash(content_lower), vip_name.lower())
+        with _ASSESS_CACHE_LOCK:
+            cached = _ASSESS_CACHE.get(key)
+        if cached is not None:
+            return cached
+        # Every bonus depends on the VIP being mentioned
+        if key[2] not in content_lower:
+            result = (0.0, self.DEFAULT_THREAT_TYPE, self._calculate_severity(0.0))
+        else:
+            counts = self._scanner.counts(content_lower)
+            score = self._score_counts(counts)
+            threat_type = next((t for t in self.THREAT_TYPES if counts[t]), self.DEFAULT_THREAT_TYPE)
+            result = (score, threat_type, self._calculate_severity(score))
+        with _ASSESS_CACHE_LOCK:
+            _ASSESS_CACHE[key] = result
+        return result
+
+    def _score_counts(self, counts: Dict[str, int]) -> float:
+        """Threat score from per-tag keyword counts for content mentioning the VIP"""
+        raise NotImplementedError
+
+    def _calculate_severity(self, threat_score: float) -> str:
+        """Calculate threat severity based on score"""
+        return self.SEVERITY_LABELS[bisect_right(self.SEVERITY_THRESHOLDS, threat_score)]
+
+    async def aclose(self):
+        """Release network resources held by the monitor"""
+
 class RedditMonitor(BasePlatformMonitor):
-    """Reddit monitoring using PRAW"""
+    """Reddit monitoring using Async PRAW"""
+
+    SEVERITY_THRESHOLDS = (0.7, 0.8, 0.9)
+    SEVERITY_LABELS = ('low', 'medium', 'high', 'critical')
+
+    _scanner = _KeywordScanner({
+        # Threat indicators
+        'threat': [
+            'kill', 'murder', 'assassinate', 'bomb', 'attack', 'hurt', 'harm',
+            'stalk', 'follow', 'hunt', 'track', 'expose', 'doxx', 'leak',
+            'fake', 'imposter', 'pretend', 'scam', 'fraud', 'lie',
+            'hate', 'destroy', 'ruin', 'revenge', 'payback'
+        ],
+        # Context modifiers
+        'personal': ['address', 'phone', 'home', 'family', 'children'],
+        'urgency': ['now', 'today', 'tonight', 'soon', 'immediately'],
+        # Threat type classification
+        'physical_threat': ['kill', 'murder', 'assassinate', 'bomb', 'attack'],
+        'doxxing': ['doxx', 'address', 'phone', 'expose', 'leak'],
+        'impersonation': ['fake', 'imposter', 'pretend', 'scam'],
+        'misinformation': ['lie', 'false', 'misinformation'],
+        'stalking': ['stalk', 'follow', 'hunt', 'track'],
+    })
+    THREAT_TYPES = ('physical_threat', 'doxxing', 'impersonation', 'misinformation', 'stalking')
+    DEFAULT_THREAT_TYPE = 'harassment'
     
     def __init__(self):
         super().__init__("reddit")
         self.reddit = None
+        self._hot_lock = asyncio.Lock()
         self._initialize_client()
         
     def _initialize_client(self):
@@ -46,11 +290,10 @@ class RedditMonitor(BasePlatformMonitor):
             user_agent = os.getenv('REDDIT_USER_AGENT', 'Protego-VIP-Monitor-v1.0')
             
             if client_id and client_secret:
-                self.reddit = praw.Reddit(
+                self.reddit = asyncpraw.Reddit(
                     client_id=client_id,
                     client_secret=client_secret,
-                    user_agent=user_agent,
-                    check_for_async=False  # silence async environment warnings
+                    user_agent=user_agent
                 )
                 self.is_enabled = True
                 logger.info("Reddit monitor initialized successfully")
@@ -61,147 +304,145 @@ class RedditMonitor(BasePlatformMonitor):
             
     def is_api_configured(self) -> bool:
         return self.reddit is not None
+
+    async def aclose(self):
+        if self.reddit is not None:
+            await self.reddit.close()
+        await super().aclose()
         
     async def monitor_vip(self, vip_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Monitor VIP mentions on Reddit (run blocking PRAW calls in a thread)."""
+        """Monitor VIP mentions on Reddit"""
         if not self.is_enabled:
             return []
 
-        def _collect_sync() -> List[Dict[str, Any]]:
+        vip_name = vip_profile.get('name', '')
+        keywords = vip_profile.get('keywords', [])
+        search_terms = [vip_name] + keywords
+        vip_scanner = _vip_scanner(vip_name, tuple(keywords))
+
+        async def _search(term: str) -> List[Dict[str, Any]]:
             threats: List[Dict[str, Any]] = []
-            vip_name = vip_profile.get('name', '')
-            keywords = vip_profile.get('keywords', [])
-            search_terms = [vip_name] + keywords
+            subreddit = await self.reddit.subreddit('all')
+            async for submission in subreddit.search(term, time_filter='day', limit=25):
+                text = f"{submission.title} {submission.selftext}"
+                text_lower = text.lower()
+                threat_score, threat_type, severity = self._assess_threat(text, vip_name, content_lower=text_lower)
+                if threat_score > 0.6:
+                    threats.append({
+                        'vip_id': vip_profile.get('id'),
+                        'vip_name': vip_name,
+                        'platform': 'reddit',
+                        'threat_type': threat_type,
+                        'severity': severity,
+                        'confidence_score': threat_score,
+                        'content': f"{submission.title}\n\n{submission.selftext[:500]}",
+                        'source_url': f"https://reddit.com{submission.permalink}",
+                        'evidence': {
+                            'submission_id': submission.id,
+                            'subreddit': str(submission.subreddit),
+                            'score': submission.score,
+                            'num_comments': submission.num_comments,
+                            'author': str(submission.author) if submission.author else '[deleted]'
+                        }
+                    })
+            return threats
 
-            for term in search_terms:
-                for submission in self.reddit.subreddit('all').search(term, time_filter='day', limit=25):
-                    threat_score = self._analyze_content_for_threats(
-                        f"{submission.title} {submission.selftext}", vip_name
+        async def _scan_hot() -> List[Dict[str, Any]]:
+            # Comments are matched against every search term, so the hot
+            # listing only needs to be scanned once per VIP
+            threats: List[Dict[str, Any]] = []
+            # Threads that already produced a critical alert need no further scanning
+            escalated: Set[str] = set()
+            for comment in await self._hot_comments():
+                if comment['submission_id'] in escalated:
+                    continue
+                if vip_scanner.mentions(comment['body_lower']):
+                    threat_score, threat_type, severity = self._assess_threat(
+                        comment['body'], vip_name, content_lower=comment['body_lower']
                     )
                     if threat_score > 0.6:
                         threats.append({
                             'vip_id': vip_profile.get('id'),
                             'vip_name': vip_name,
                             'platform': 'reddit',
-                            'threat_type': self._classify_threat_type(f"{submission.title} {submission.selftext}"),
-                            'severity': self._calculate_severity(threat_score),
+                            'threat_type': threat_type,
+                            'severity': severity,
                             'confidence_score': threat_score,
-                            'content': f"{submission.title}\n\n{submission.selftext[:500]}",
-                            'source_url': f"https://reddit.com{submission.permalink}",
+                            'content': comment['body'][:500],
+                            'source_url': f"https://reddit.com{comment['permalink']}",
                             'evidence': {
-                                'submission_id': submission.id,
-                                'subreddit': str(submission.subreddit),
-                                'score': submission.score,
-                                'num_comments': submission.num_comments,
-                                'author': str(submission.author) if submission.author else '[deleted]'
+                                'comment_id': comment['id'],
+                                'subreddit': comment['subreddit'],
+                                'parent_submission': comment['submission_id'],
+                                'score': comment['score'],
+                                'author': comment['author']
                             }
                         })
-
-                for submission in self.reddit.subreddit('all').hot(limit=10):
-                    submission.comments.replace_more(limit=0)
-                    for comment in submission.comments.list()[:50]:
-                        if any(keyword.lower() in comment.body.lower() for keyword in search_terms):
-                            threat_score = self._analyze_content_for_threats(comment.body, vip_name)
-                            if threat_score > 0.6:
-                                threats.append({
-                                    'vip_id': vip_profile.get('id'),
-                                    'vip_name': vip_name,
-                                    'platform': 'reddit',
-                                    'threat_type': self._classify_threat_type(comment.body),
-                                    'severity': self._calculate_severity(threat_score),
-                                    'confidence_score': threat_score,
-                                    'content': comment.body[:500],
-                                    'source_url': f"https://reddit.com{comment.permalink}",
-                                    'evidence': {
-                                        'comment_id': comment.id,
-                                        'subreddit': str(submission.subreddit),
-                                        'parent_submission': submission.id,
-                                        'score': comment.score,
-                                        'author': str(comment.author) if comment.author else '[deleted]'
-                                    }
-                                })
+                        if threat_score >= 0.9:
+                            escalated.add(comment['submission_id'])
             return threats
 
         try:
-            return await asyncio.to_thread(_collect_sync)
+            results = await asyncio.gather(
+                *(_search(term) for term in search_terms),
+                _scan_hot()
+            )
+            return [threat for batch in results for threat in batch]
         except Exception as e:
             logger.error(f"Error monitoring Reddit for {vip_profile.get('name')}: {e}")
             return []
         
-    def _analyze_content_for_threats(self, content: str, vip_name: str) -> float:
-        """Analyze content for threat indicators"""
-        if not content:
-            return 0.0
-            
-        content_lower = content.lower()
-        vip_lower = vip_name.lower()
-        
-        # Threat indicators
-        threat_keywords = [
-            'kill', 'murder', 'assassinate', 'bomb', 'attack', 'hurt', 'harm',
-            'stalk', 'follow', 'hunt', 'track', 'expose', 'doxx', 'leak',
-            'fake', 'imposter', 'pretend', 'scam', 'fraud', 'lie',
-            'hate', 'destroy', 'ruin', 'revenge', 'payback'
-        ]
-        
-        # Context modifiers
-        personal_indicators = ['address', 'phone', 'home', 'family', 'children']
-        urgency_indicators = ['now', 'today', 'tonight', 'soon', 'immediately']
+    def _score_counts(self, counts: Dict[str, int]) -> float:
+        return _reddit_threat_score(counts['threat'], counts['personal'], counts['urgency'])
         
-        score = 0.0
-        
-        # Check if VIP is mentioned
-        if vip_lower in content_lower:
-            score += 0.3
-            
-            # Check for threat keywords
-            threat_count = sum(1 for keyword in threat_keywords if keyword in content_lower)
-            score += min(threat_count * 0.2, 0.6)
-            
-            # Check for personal information
-            personal_count = sum(1 for indicator in personal_indicators if indicator in content_lower)
-            score += min(personal_count * 0.15, 0.3)
-            
-            # Check for urgency
-            urgency_count = sum(1 for indicator in urgency_indicators if indicator in content_lower)
-            score += min(urgency_count * 0.1, 0.2)
-            
-        return min(score, 1.0)
-        
-    def _classify_threat_type(self, content: str) -> str:
-        """Classify the type of threat"""
-        content_lower = content.lower()
-        
-        if any(word in content_lower for word in ['kill', 'murder', 'assassinate', 'bomb', 'attack']):
-            return 'physical_threat'
-        elif any(word in content_lower for word in ['doxx', 'address', 'phone', 'expose', 'leak']):
-            return 'doxxing'
-        elif any(word in content_lower for word in ['fake', 'imposter', 'pretend', 'scam']):
-            return 'impersonation'
-        elif any(word in content_lower for word in ['lie', 'false', 'misinformation']):
-            return 'misinformation'
-        elif any(word in content_lower for word in ['stalk', 'follow', 'hunt', 'track']):
-            return 'stalking'
-        else:
-            return 'harassment'
-            
-    def _calculate_severity(self, threat_score: float) -> str:
-        """Calculate threat severity based on score"""
-        if threat_score >= 0.9:
-            return 'critical'
-        elif threat_score >= 0.8:
-            return 'high'
-        elif threat_score >= 0.7:
-            return 'medium'
-        else:
-            return 'low'
+    async def _hot_comments(self) -> List[Dict[str, Any]]:
+        """Comments from r/all hot posts, fetched once and shared by every VIP scan within the TTL"""
+        async with self._hot_lock:
+            cached = _REDDIT_HOT_CACHE.get('all')
+            if cached is not None:
+                return cached
+            comments: List[Dict[str, Any]] = []
+            subreddit = await self.reddit.subreddit('all')
+            async for submission in subreddit.hot(limit=10):
+                await submission.load()
+                await submission.comments.replace_more(limit=0)
+                for comment in islice(await submission.comments.list(), REDDIT_COMMENT_LIMIT):
+                    comments.append({
+                        'id': comment.id,
+                        'body': comment.body,
+                        'body_lower': comment.body.lower(),
+                        'permalink': comment.permalink,
+                        'score': comment.score,
+                        'author': str(comment.author) if comment.author else '[deleted]',
+                        'subreddit': str(submission.subreddit),
+                        'submission_id': submission.id
+                    })
+            _REDDIT_HOT_CACHE['all'] = comments
+            return comments
 
 class NewsMonitor(BasePlatformMonitor):
     """News monitoring using News API"""
+
+    # News-specific threat indicators
+    _scanner = _KeywordScanner({
+        'threat': [
+            'scandal', 'controversy', 'allegation', 'accused', 'lawsuit',
+            'investigation', 'fraud', 'corruption', 'leak', 'exposed',
+            'crisis', 'downfall', 'resignation', 'fired', 'stepped down'
+        ],
+        # Threat type classification
+        'reputation_damage': ['scandal', 'controversy', 'allegation'],
+        'information_leak': ['leak', 'exposed', 'revealed'],
+        'legal_threat': ['fraud', 'corruption', 'illegal'],
+    })
+    THREAT_TYPES = ('reputation_damage', 'information_leak', 'legal_threat')
+    DEFAULT_THREAT_TYPE = 'misinformation'
+    
+    API_URL = 'https://newsapi.org/v2/everything'
     
     def __init__(self):
         super().__init__("news")
-        self.client = None
+        self.api_key = None
         self._initialize_client()
         
     def _initialize_client(self):
@@ -209,7 +450,8 @@ class NewsMonitor(BasePlatformMonitor):
         try:
             api_key = os.getenv('NEWS_API_KEY')
             if api_key:
-                self.client = NewsApiClient(api_key=api_key)
+                self.api_key = api_key
+                self._session_headers = {'X-Api-Key': api_key}
                 self.is_enabled = True
                 logger.info("News API monitor initialized successfully")
             else:
@@ -218,7 +460,7 @@ class NewsMonitor(BasePlatformMonitor):
             logger.error(f"Failed to initialize News API client: {e}")
             
     def is_api_configured(self) -> bool:
-        return self.client is not None
+        return self.api_key is not None
         
     async def monitor_vip(self, vip_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Monitor VIP mentions in news"""
@@ -232,94 +474,81 @@ class NewsMonitor(BasePlatformMonitor):
             keywords = vip_profile.get('keywords', [])
             
             # Search for recent news mentioning the VIP
-            for keyword in [vip_name] + keywords[:3]:  # Limit to avoid API quota
-                articles = self.client.get_everything(
-                    q=keyword,
-                    language='en',
-                    sort_by='publishedAt',
-                    from_param=datetime.now().strftime('%Y-%m-%d')
-                )
+            today = datetime.now().strftime('%Y-%m-%d')
+            # One OR-joined query covers the name and top keywords
+            terms = [vip_name] + keywords[:3]  # Limit to avoid API quota
+            query = ' OR '.join(f'"{term}"' for term in terms if term)
+            articles = await self._search_articles(query, today)
+            
+            for article in articles.get('articles', [])[:40]:  # Limit results
+                content = f"{article.get('title', '')} {article.get('description', '')}"
+                threat_score, threat_type, severity = self._assess_threat(content, vip_name)
                 
-                for article in articles.get('articles', [])[:10]:  # Limit results
-                    content = f"{article.get('title', '')} {article.get('description', '')}"
-                    threat_score = self._analyze_news_for_threats(content, vip_name)
+                if threat_score > 0.5:
+                    threats.append({
+                        'vip_id': vip_profile.get('id'),
+                        'vip_name': vip_name,
+                        'platform': 'news',
+                        'threat_type': threat_type,
+                        'severity': severity,
+                        'confidence_score': threat_score,
+                        'content': content,
+                        'source_url': article.get('url', ''),
+                        'evidence': {
+                            'source': article.get('source', {}).get('name', ''),
+                            'published_at': article.get('publishedAt', ''),
+                            'author': article.get('author', ''),
+                            'url_to_image': article.get('urlToImage', '')
+                        }
+                    })
                     
-                    if threat_score > 0.5:
-                        threats.append({
-                            'vip_id': vip_profile.get('id'),
-                            'vip_name': vip_name,
-                            'platform': 'news',
-                            'threat_type': self._classify_news_threat(content),
-                            'severity': self._calculate_severity(threat_score),
-                            'confidence_score': threat_score,
-                            'content': content,
-                            'source_url': article.get('url', ''),
-                            'evidence': {
-                                'source': article.get('source', {}).get('name', ''),
-                                'published_at': article.get('publishedAt', ''),
-                                'author': article.get('author', ''),
-                                'url_to_image': article.get('urlToImage', '')
-                            }
-                        })
-                        
         except Exception as e:
             logger.error(f"Error monitoring news for {vip_profile.get('name')}: {e}")
             
         return threats
         
-    def _analyze_news_for_threats(self, content: str, vip_name: str) -> float:
-        """Analyze news content for threat indicators"""
-        if not content:
-            return 0.0
-            
-        content_lower = content.lower()
-        vip_lower = vip_name.lower()
+    def _score_counts(self, counts: Dict[str, int]) -> float:
+        return min(0.2 + min(counts['threat'] * 0.15, 0.8), 1.0)
         
-        # News-specific threat indicators
-        threat_keywords = [
-            'scandal', 'controversy', 'allegation', 'accused', 'lawsuit',
-            'investigation', 'fraud', 'corruption', 'leak', 'exposed',
-            'crisis', 'downfall', 'resignation', 'fired', 'stepped down'
-        ]
-        
-        score = 0.0
-        
-        if vip_lower in content_lower:
-            score += 0.2
-            
-            threat_count = sum(1 for keyword in threat_keywords if keyword in content_lower)
-            score += min(threat_count * 0.15, 0.8)
-            
-        return min(score, 1.0)
-        
-    def _classify_news_threat(self, content: str) -> str:
-        """Classify news threat type"""
-        content_lower = content.lower()
-        
-        if any(word in content_lower for word in ['scandal', 'controversy', 'allegation']):
-            return 'reputation_damage'
-        elif any(word in content_lower for word in ['leak', 'exposed', 'revealed']):
-            return 'information_leak'
-        elif any(word in content_lower for word in ['fraud', 'corruption', 'illegal']):
-            return 'legal_threat'
-        else:
-            return 'misinformation'
-            
-    def _calculate_severity(self, threat_score: float) -> str:
-        """Calculate threat severity"""
-        if threat_score >= 0.8:
-            return 'high'
-        elif threat_score >= 0.6:
-            return 'medium'
-        else:
-            return 'low'
+    async def _search_articles(self, query: str, today: str) -> Dict[str, Any]:
+        """NewsAPI search, served from the TTL cache when repeated within a cycle window"""
+        key = (query, today)
+        if key in _NEWS_CACHE:
+            return _NEWS_CACHE[key]
+        params = {'q': query, 'language': 'en', 'sortBy': 'publishedAt', 'from': today, 'pageSize': 40}
+        session = await get_http_session()
+        async with session.get(self.API_URL, params=params, headers=self._session_headers) as resp:
+            resp.raise_for_status()
+            articles = await resp.json()
+        _NEWS_CACHE[key] = articles
+        return articles
 
 class YouTubeMonitor(BasePlatformMonitor):
     """YouTube monitoring using YouTube Data API"""
+
+    _scanner = _KeywordScanner({
+        'threat': [
+            'exposed', 'truth', 'scandal', 'controversy', 'fake', 'lie',
+            'scam', 'fraud', 'reveal', 'secret', 'conspiracy', 'leaked'
+        ],
+        # Threat type classification
+        'information_exposure': ['exposed', 'reveal', 'truth', 'leaked'],
+        'misinformation': ['fake', 'scam', 'fraud'],
+        'reputation_damage': ['scandal', 'controversy'],
+    })
+    THREAT_TYPES = ('information_exposure', 'misinformation', 'reputation_damage')
+    DEFAULT_THREAT_TYPE = 'defamation'
+    
+    API_URL = 'https://www.googleapis.com/youtube/v3/search'
+    MAX_QUERY_LENGTH = 500
+    # Results fetched per VIP per query, and the API's per-request maximum
+    RESULTS_PER_QUERY = 25
+    MAX_RESULTS_PER_PAGE = 50
+    supports_batch = True
     
     def __init__(self):
         super().__init__("youtube")
-        self.service = None
+        self.api_key = None
         self._initialize_client()
         
     def _initialize_client(self):
@@ -327,7 +556,7 @@ class YouTubeMonitor(BasePlatformMonitor):
         try:
             api_key = os.getenv('YOUTUBE_API_KEY')
             if api_key:
-                self.service = build('youtube', 'v3', developerKey=api_key)
+                self.api_key = api_key
                 self.is_enabled = True
                 logger.info("YouTube monitor initialized successfully")
             else:
@@ -336,7 +565,7 @@ class YouTubeMonitor(BasePlatformMonitor):
             logger.error(f"Failed to initialize YouTube client: {e}")
             
     def is_api_configured(self) -> bool:
-        return self.service is not None
+        return self.api_key is not None
         
     async def monitor_vip(self, vip_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Monitor VIP mentions on YouTube"""
@@ -350,99 +579,170 @@ class YouTubeMonitor(BasePlatformMonitor):
             keywords = vip_profile.get('keywords', [])
             
             # Search for recent videos mentioning the VIP
-            for keyword in [vip_name] + keywords[:2]:
-                search_response = self.service.search().list(
-                    q=keyword,
-                    part='id,snippet',
-                    maxResults=25,
-                    order='date',
-                    type='video',
-                    publishedAfter=datetime.now().strftime('%Y-%m-%dT00:00:00Z')
-                ).execute()
-                
-                for search_result in search_response.get('items', []):
-                    video_title = search_result['snippet']['title']
-                    video_description = search_result['snippet']['description']
-                    content = f"{video_title} {video_description}"
-                    
-                    threat_score = self._analyze_video_for_threats(content, vip_name)
-                    
-                    if threat_score > 0.5:
-                        video_id = search_result['id']['videoId']
-                        threats.append({
-                            'vip_id': vip_profile.get('id'),
-                            'vip_name': vip_name,
-                            'platform': 'youtube',
-                            'threat_type': self._classify_video_threat(content),
-                            'severity': self._calculate_severity(threat_score),
-                            'confidence_score': threat_score,
-                            'content': content[:500],
-                            'source_url': f"https://www.youtube.com/watch?v={video_id}",
-                            'evidence': {
-                                'video_id': video_id,
-                                'channel_title': search_result['snippet']['channelTitle'],
-                                'channel_id': search_result['snippet']['channelId'],
-                                'published_at': search_result['snippet']['publishedAt'],
-                                'thumbnail': search_result['snippet']['thumbnails']['default']['url']
-                            }
-                        })
+            published_after = datetime.now().strftime('%Y-%m-%dT00:00:00Z')
+            responses = await asyncio.gather(*(
+                self._search_videos(keyword, published_after)
+                for keyword in [vip_name] + keywords[:2]
+            ))
+            
+            for search_response in responses:
+                threats.extend(self._threats_from_results(vip_profile, search_response.get('items', [])))
                         
         except Exception as e:
             logger.error(f"Error monitoring YouTube for {vip_profile.get('name')}: {e}")
             
         return threats
         
-    def _analyze_video_for_threats(self, content: str, vip_name: str) -> float:
-        """Analyze video content for threats"""
-        if not content:
-            return 0.0
-            
-        content_lower = content.lower()
-        vip_lower = vip_name.lower()
-        
-        threat_keywords = [
-            'exposed', 'truth', 'scandal', 'controversy', 'fake', 'lie',
-            'scam', 'fraud', 'reveal', 'secret', 'conspiracy', 'leaked'
-        ]
-        
-        score = 0.0
-        
-        if vip_lower in content_lower:
-            score += 0.3
+    async def monitor_batch(self, vip_profiles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Monitor several VIPs: names share combined searches, keywords are searched as in monitor_vip"""
+        if not self.is_enabled:
+            return [[] for _ in vip_profiles]
+
+        # Group VIPs so each OR-joined query stays under the search length limit
+        batches: List[List[int]] = []
+        length = 0
+        for i, vip in enumerate(vip_profiles):
+            name_length = len(vip.get('name', '')) + 1
+            if not batches or length + name_length > self.MAX_QUERY_LENGTH:
+                batches.append([])
+                length = 0
+            batches[-1].append(i)
+            length += name_length
+
+        published_after = datetime.now().strftime('%Y-%m-%dT00:00:00Z')
+        limit = asyncio.Semaphore(int(os.getenv('PLATFORM_CONCURRENCY', '10')))
+
+        async def _bounded(coro):
+            async with limit:
+                return await coro
+
+        # A combined name search pages through RESULTS_PER_QUERY results per VIP in it
+        name_results = await asyncio.gather(*(
+            _bounded(self._search_pages(
+                '|'.join(vip_profiles[i].get('name', '') for i in batch),
+                published_after,
+                self.RESULTS_PER_QUERY * len(batch)
+            ))
+            for batch in batches
+        ), return_exceptions=True)
+
+        # Keyword searches stay per keyword, each run once even if several VIPs share it
+        keywords = list(dict.fromkeys(
+            keyword for vip in vip_profiles for keyword in vip.get('keywords', [])[:2]
+        ))
+        keyword_results = await asyncio.gather(*(
+            _bounded(self._search_videos(keyword, published_after)) for keyword in keywords
+        ), return_exceptions=True)
+        keyword_items = {}
+        for keyword, response in zip(keywords, keyword_results):
+            if isinstance(response, Exception):
+                logger.warning(f"YouTube keyword search failed for '{keyword}': {response}")
+            else:
+                keyword_items[keyword] = response.get('items', [])
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in vip_profiles]
+        for batch, items in zip(batches, name_results):
+            if isinstance(items, Exception):
+                logger.warning(f"Batched YouTube search failed, falling back to per-VIP search: {items}")
+                for i in batch:
+                    results[i] = await self.monitor_vip(vip_profiles[i])
+                continue
+            for i in batch:
+                vip = vip_profiles[i]
+                threats = self._threats_from_results(vip, items)
+                for keyword in vip.get('keywords', [])[:2]:
+                    threats.extend(self._threats_from_results(vip, keyword_items.get(keyword, [])))
+                results[i] = threats
+        return results
+
+    async def _search_pages(self, query: str, published_after: str, total: int) -> List[Dict[str, Any]]:
+        """Up to total results for one query, following result pages of at most MAX_RESULTS_PER_PAGE"""
+        items: List[Dict[str, Any]] = []
+        page_token = None
+        while len(items) < total:
+            response = await self._search_videos(
+                query, published_after,
+                max_results=min(self.MAX_RESULTS_PER_PAGE, total - len(items)),
+                page_token=page_token
+            )
+            items.extend(response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return items
+
+    def _threats_from_results(self, vip_profile: Dict[str, Any], items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build threats for one VIP from YouTube search result items"""
+        threats = []
+        vip_name = vip_profile.get('name', '')
+        for search_result in items:
+            video_title = search_result['snippet']['title']
+            video_description = search_result['snippet']['description']
+            content = f"{video_title} {video_description}"
             
-            threat_count = sum(1 for keyword in threat_keywords if keyword in content_lower)
-            score += min(threat_count * 0.15, 0.7)
+            threat_score, threat_type, severity = self._assess_threat(content, vip_name)
             
-        return min(score, 1.0)
+            if threat_score > 0.5:
+                video_id = search_result['id']['videoId']
+                threats.append({
+                    'vip_id': vip_profile.get('id'),
+                    'vip_name': vip_name,
+                    'platform': 'youtube',
+                    'threat_type': threat_type,
+                    'severity': severity,
+                    'confidence_score': threat_score,
+                    'content': content[:500],
+                    'source_url': f"https://www.youtube.com/watch?v={video_id}",
+                    'evidence': {
+                        'video_id': video_id,
+                        'channel_title': search_result['snippet']['channelTitle'],
+                        'channel_id': search_result['snippet']['channelId'],
+                        'published_at': search_result['snippet']['publishedAt'],
+                        'thumbnail': search_result['snippet']['thumbnails']['default']['url']
+                    }
+                })
+        return threats
         
-    def _classify_video_threat(self, content: str) -> str:
-        """Classify video threat type"""
-        content_lower = content.lower()
+    def _score_counts(self, counts: Dict[str, int]) -> float:
+        return min(0.3 + min(counts['threat'] * 0.15, 0.7), 1.0)
         
-        if any(word in content_lower for word in ['exposed', 'reveal', 'truth', 'leaked']):
-            return 'information_exposure'
-        elif any(word in content_lower for word in ['fake', 'scam', 'fraud']):
-            return 'misinformation'
-        elif any(word in content_lower for word in ['scandal', 'controversy']):
-            return 'reputation_damage'
-        else:
-            return 'defamation'
-            
-    def _calculate_severity(self, threat_score: float) -> str:
-        """Calculate threat severity"""
-        if threat_score >= 0.8:
-            return 'high'
-        elif threat_score >= 0.6:
-            return 'medium'
-        else:
-            return 'low'
+    async def _search_videos(self, keyword: str, published_after: str, max_results: int = RESULTS_PER_QUERY,
+                             page_token: Optional[str] = None) -> Dict[str, Any]:
+        """YouTube search, served from the TTL cache when repeated within a cycle window"""
+        key = (keyword, published_after, max_results, page_token)
+        if key in _YOUTUBE_CACHE:
+            return _YOUTUBE_CACHE[key]
+        params = {
+            'q': keyword,
+            'part': 'id,snippet',
+            'maxResults': max_results,
+            'order': 'date',
+            'type': 'video',
+            'publishedAfter': published_after,
+            'key': self.api_key
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        session = await get_http_session()
+        async with session.get(self.API_URL, params=params, headers=self._session_headers) as resp:
+            resp.raise_for_status()
+            search_response = await resp.json()
+        _YOUTUBE_CACHE[key] = search_response
+        return search_response
 
 class PastebinMonitor(BasePlatformMonitor):
     """Pastebin monitoring via scraping recent pastes (no API key)."""
+
+    _scanner = _KeywordScanner({
+        'exposure': ['doxx', 'address', 'phone', 'leak', 'expose'],
+        'misinformation': ['fake', 'lie'],
+    })
+
     def __init__(self):
         super().__init__("pastebin")
         # Enabled by default; can be disabled via env
         self.is_enabled = os.getenv('ENABLE_PASTEBIN', 'true').lower() == 'true'
+        self._session_headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Protego/1.0'}
 
     def is_api_configured(self) -> bool:
         return True
@@ -452,15 +752,16 @@ class PastebinMonitor(BasePlatformMonitor):
             return []
 
         vip_name = vip_profile.get('name', '')
-        keywords = [vip_name] + vip_profile.get('keywords', [])
+        vip_scanner = _vip_scanner(vip_name, tuple(vip_profile.get('keywords', [])))
+
+        session = await get_http_session()
+        # Bound concurrent requests so the paste fan-out stays polite to Pastebin
+        semaphore = asyncio.Semaphore(8)
 
         async def _fetch(url: str) -> Optional[str]:
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Protego/1.0'
-                }
-                async with aiohttp.ClientSession(headers=headers) as session:
-                    async with session.get(url, timeout=15) as resp:
+                async with semaphore:
+                    async with session.get(url, headers=self._session_headers) as resp:
                         if resp.status == 200:
                             return await resp.text()
                         return None
@@ -473,31 +774,34 @@ class PastebinMonitor(BasePlatformMonitor):
             archive_html = await _fetch('https://pastebin.com/archive')
             if not archive_html:
                 return []
-            soup = BeautifulSoup(archive_html, 'html.parser')
-            rows = soup.select('table.maintable tr')
+            tree = lxml.html.fromstring(archive_html)
+            rows = tree.cssselect('table.maintable tr')
             paste_paths: List[str] = []
             for row in rows[1:15]:  # first 14 recent items
-                link = row.find('a')
-                if link and link.get('href', '').startswith('/'):
-                    paste_paths.append(link['href'])
+                links = row.cssselect('a')
+                href = links[0].get('href', '') if links else ''
+                if href.startswith('/'):
+                    paste_paths.append(href)
 
-            for path in paste_paths:
-                paste_html = await _fetch(f'https://pastebin.com{path}')
-                if not paste_html:
+            pages = await asyncio.gather(
+                *(_fetch(f'https://pastebin.com{path}') for path in paste_paths),
+                return_exceptions=True
+            )
+            for path, paste_html in zip(paste_paths, pages):
+                if not paste_html or isinstance(paste_html, BaseException):
+                    continue
+                content_text = self._paste_text(paste_html, path)
+                if content_text is None:
                     continue
-                psoup = BeautifulSoup(paste_html, 'html.parser')
-                content_el = psoup.find('textarea', { 'class': 'textarea' })
-                content_text = content_el.text if content_el else psoup.get_text("\n")
                 lower = content_text.lower()
-                if any(k.lower() in lower for k in keywords if k):
-                    score = 0.6
-                    if any(w in lower for w in ['doxx','address','phone','leak','expose']):
-                        score = 0.8
+                if vip_scanner.mentions(lower):
+                    counts = self._scanner.counts(lower)
+                    score = 0.8 if counts['exposure'] else 0.6
                     threats.append({
                         'vip_id': vip_profile.get('id'),
                         'vip_name': vip_name,
                         'platform': 'pastebin',
-                        'threat_type': 'misinformation' if 'fake' in lower or 'lie' in lower else 'information_leak',
+                        'threat_type': 'misinformation' if counts['misinformation'] else 'information_leak',
                         'severity': 'high' if score >= 0.8 else 'medium',
                         'confidence_score': score,
                         'content': content_text[:1000],
@@ -512,6 +816,20 @@ class PastebinMonitor(BasePlatformMonitor):
 
         return threats
 
+    @staticmethod
+    def _paste_text(paste_html: str, path: str) -> Optional[str]:
+        """Paste body text with its line breaks, or None if the page cannot be parsed"""
+        try:
+            ptree = lxml.html.fromstring(paste_html)
+        except (lxml.etree.ParserError, ValueError) as e:
+            logger.warning(f"Pastebin parse failed for {path}: {e}")
+            return None
+        content_els = ptree.cssselect('textarea.textarea')
+        if content_els:
+            return content_els[0].text_content()
+        # One line per text node so the paste keeps its line breaks
+        return "\n".join(ptree.itertext())
+
 # Initialize all monitors
 def get_all_monitors() -> List[BasePlatformMonitor]:
     """Get all available platform monitors"""
@@ -2,25 +2,55 @@
 Main monitoring service that coordinates all platform monitors
 """
 import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
-from .platforms import get_active_monitors
-from .ai_analyzer import analyze_content_for_threats
+from .platforms import get_active_monitors, close_http_session
+from .ai_analyzer import analyze_content_for_threats, ai_analyzer as _analyzer_instance
 
 logger = logging.getLogger(__name__)
 
+# Profile fields the platform monitors and threat processing read
+VIP_MONITOR_PROJECTION = {"_id": 0, "id": 1, "name": 1, "keywords": 1, "platforms": 1}
+
+STATUS_COUNT_TTL_SECONDS = 30
+STOP_GRACE_SECONDS = 10
+POOL_WARMUP_CONNECTIONS = 20
+DEDUP_WINDOW_SECONDS = 24 * 3600
+DEDUP_PRUNE_EVERY = 1000
+DUPLICATE_KEY_ERROR = 11000
+
 class VIPMonitoringService:
     """Main service for coordinating VIP monitoring across platforms"""
     
     def __init__(self, database):
         self.database = database
         self.monitors = get_active_monitors()
+        self._monitor_meta = self._build_monitor_meta()
         self.is_running = False
         self.monitoring_tasks = []
+        # Set on shutdown so loops wake from their interval wait immediately
+        self._stop_event = asyncio.Event()
+        # (dedup digest, upsert) for threats found during a platform tick, written in one batch
+        self._pending_threats: List[Tuple[bytes, UpdateOne]] = []
+        # Bounds concurrent per-VIP platform calls
+        self._vip_sem = asyncio.Semaphore(int(os.getenv('PLATFORM_CONCURRENCY', '10')))
+        # Active VIP count served to status polls until it expires
+        self._vip_count = 0
+        self._vip_count_expires = 0.0
+        # Content hashes stored or ruled out in the dedup window, mapped to their expiry time
+        self._recent_hashes: Dict[bytes, float] = {}
+        self._hashes_since_prune = 0
+        # Until the service has run for a full window, misses are confirmed against MongoDB
+        # through the (content_hash, vip_id) index
+        self._dedup_cold_until = time.time() + DEDUP_WINDOW_SECONDS
         
     async def start_monitoring(self):
         """Start the monitoring service"""
@@ -29,17 +59,20 @@ class VIPMonitoringService:
             return
             
         self.is_running = True
+        self._stop_event.clear()
         logger.info(f"Starting VIP monitoring service with {len(self.monitors)} active monitors")
         
+        # Open pooled connections up front so the first burst of scans doesn't queue for them
+        try:
+            await asyncio.gather(*(self.database.command('ping') for _ in range(POOL_WARMUP_CONNECTIONS)))
+        except Exception as e:
+            logger.warning(f"MongoDB pool warm-up failed: {e}")
+        
         # Start monitoring task for each platform
         for monitor in self.monitors:
             task = asyncio.create_task(self._platform_monitoring_loop(monitor))
             self.monitoring_tasks.append(task)
         
-        # Start periodic cleanup task
-        cleanup_task = asyncio.create_task(self._cleanup_old_threats())
-        self.monitoring_tasks.append(cleanup_task)
-        
         logger.info("VIP monitoring service started successfully")
     
     async def stop_monitoring(self):
@@ -48,14 +81,26 @@ class VIPMonitoringService:
             return
             
         self.is_running = False
+        self._stop_event.set()
         
-        # Cancel all monitoring tasks
-        for task in self.monitoring_tasks:
-            task.cancel()
+        # Loops waiting out their interval exit on the stop signal; cancel any still mid-scan
+        if self.monitoring_tasks:
+            _, pending = await asyncio.wait(self.monitoring_tasks, timeout=STOP_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
         
         # Wait for tasks to complete
         await asyncio.gather(*self.monitoring_tasks, return_exceptions=True)
         self.monitoring_tasks.clear()
+        await self._flush_pending()
+
+        # Close clients held by the monitors, then the shared HTTP session
+        for monitor in self.monitors:
+            try:
+                await monitor.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing {monitor.platform_name} monitor: {e}")
+        await close_http_session()
         
         logger.info("VIP monitoring service stopped")
     
@@ -69,37 +114,108 @@ class VIPMonitoringService:
         while self.is_running:
             try:
                 await self._monitor_platform(monitor)
-                await asyncio.sleep(interval)
+                if await self._wait_for_stop(interval):
+                    break
             except asyncio.CancelledError:
                 logger.info(f"Monitoring loop for {platform_name} cancelled")
                 break
             except Exception as e:
                 logger.error(f"Error in {platform_name} monitoring loop: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute before retry
+                if await self._wait_for_stop(60):  # Wait 1 minute before retry
+                    break
+    
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds; True if the service was stopped meanwhile"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def _monitor_platform(self, monitor):
         """Monitor all VIPs on a specific platform"""
         platform_name = monitor.platform_name
         
         try:
-            # Get all active VIPs
-            vips = []
-            async for vip in self.database.vip_profiles.find({"status": "active"}):
-                # Check if this platform is enabled for the VIP
-                if not vip.get('platforms') or platform_name in vip.get('platforms', []):
-                    vips.append(vip)
+            # Get active VIPs with this platform enabled (no platform list means all)
+            cursor = self.database.vip_profiles.find(
+                {
+                    "status": "active",
+                    "$or": [
+                        {"platforms": {"$exists": False}},
+                        {"platforms": {"$size": 0}},
+                        {"platforms": None},
+                        {"platforms": platform_name}
+                    ]
+                },
+                projection=VIP_MONITOR_PROJECTION
+            ).batch_size(500)
+            vips = [vip async for vip in cursor]
             
             logger.info(f"Monitoring {len(vips)} VIPs on {platform_name}")
             
-            # Monitor each VIP
-            for vip in vips:
-                try:
-                    await self._monitor_vip_on_platform(monitor, vip)
-                except Exception as e:
-                    logger.error(f"Error monitoring VIP {vip.get('name')} on {platform_name}: {e}")
+            # Monitors that can share API calls across VIPs scan them together; the
+            # per-VIP analysis then runs concurrently under the same concurrency limit
+            if monitor.supports_batch and vips:
+                batch_results = await monitor.monitor_batch(vips)
+                results = await asyncio.gather(
+                    *(self._bounded_process(vip, platform_name, threats)
+                      for vip, threats in zip(vips, batch_results)),
+                    return_exceptions=True
+                )
+                for vip, result in zip(vips, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error processing threats for VIP {vip.get('name')} on {platform_name}: {result}")
+                return
+            
+            # Monitor VIPs concurrently, bounded by the platform concurrency limit
+            results = await asyncio.gather(
+                *(self._bounded_monitor(monitor, vip) for vip in vips),
+                return_exceptions=True
+            )
+            for vip, result in zip(vips, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error monitoring VIP {vip.get('name')} on {platform_name}: {result}")
                     
         except Exception as e:
             logger.error(f"Error in platform monitoring for {platform_name}: {e}")
+        finally:
+            await self._flush_pending()
+    
+    async def _flush_pending(self):
+        """Write buffered threat upserts in one unordered, acknowledged batch"""
+        if not self._pending_threats:
+            return
+        batch, self._pending_threats = self._pending_threats, []
+        await self._write_threats(batch)
+    
+    async def _write_threats(self, batch: List[Tuple[bytes, UpdateOne]]):
+        """Upsert threats in one unordered batch; only stored threats enter the dedup window"""
+        failed = set()
+        try:
+            await self.database.threat_alerts.bulk_write([upsert for _, upsert in batch], ordered=False)
+        except BulkWriteError as e:
+            # A duplicate key means a concurrent upsert already stored that threat
+            errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != DUPLICATE_KEY_ERROR]
+            failed = {err['index'] for err in errors}
+            if errors:
+                logger.error(f"Error writing {len(errors)} of {len(batch)} threats: {errors[0].get('errmsg')}")
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} threats: {e}")
+            return
+        for index, (digest, _) in enumerate(batch):
+            if index not in failed:
+                self._mark_seen(digest)
+    
+    async def _bounded_monitor(self, monitor, vip_profile):
+        """Monitor a VIP on a platform while holding a concurrency slot"""
+        async with self._vip_sem:
+            return await self._monitor_vip_on_platform(monitor, vip_profile)
+    
+    async def _bounded_process(self, vip_profile, platform_name, threats):
+        """Analyze one VIP's batch-scan threats while holding a concurrency slot"""
+        async with self._vip_sem:
+            await self._process_vip_threats(vip_profile, platform_name, threats)
     
     async def _monitor_vip_on_platform(self, monitor, vip_profile):
         """Monitor a specific VIP on a platform"""
@@ -109,54 +225,44 @@ class VIPMonitoringService:
         try:
             # Get threats from platform monitor
             threats = await monitor.monitor_vip(vip_profile)
-            
-            if threats:
-                logger.info(f"Found {len(threats)} potential threats for {vip_name} on {platform_name}")
-                
-                # Analyze each threat with AI
-                for threat_data in threats:
-                    await self._process_threat(threat_data, vip_profile)
+            await self._process_vip_threats(vip_profile, platform_name, threats)
                     
         except Exception as e:
             logger.error(f"Error monitoring {vip_name} on {platform_name}: {e}")
     
-    async def _process_threat(self, threat_data: Dict[str, Any], vip_profile: Dict[str, Any]):
-        """Process and analyze a potential threat"""
+    async def _process_vip_threats(self, vip_profile: Dict[str, Any], platform_name: str, threats: List[Dict[str, Any]]):
+        """Analyze and store the threats a monitor found for one VIP"""
+        if threats:
+            logger.info(f"Found {len(threats)} potential threats for {vip_profile.get('name', 'Unknown')} on {platform_name}")
+            
+            # Analyze each threat with AI
+            for threat_data in threats:
+                await self._process_threat(threat_data, vip_profile)
+    
+    async def _process_threat(self, threat_data: Dict[str, Any], vip_profile: Dict[str, Any], immediate: bool = False):
+        """Process and analyze a potential threat; immediate writes it with an acknowledged insert"""
         try:
             content = threat_data.get('content', '')
             vip_name = vip_profile.get('name', '')
             platform = threat_data.get('platform', 'unknown')
             
             # Skip if we've already processed this exact content recently
-            existing_threat = await self.database.threat_alerts.find_one({
-                "content": content,
-                "vip_id": threat_data.get('vip_id'),
-                "created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-            })
-            
-            if existing_threat:
+            content_hash = hashlib.sha1(content.encode('utf-8', 'ignore')).hexdigest()
+            digest = self._dedup_digest(content, threat_data.get('vip_id'))
+            if await self._seen_recently(digest, content_hash, threat_data.get('vip_id')):
                 return
             
-            # Analyze threat with AI
-            ai_analysis = await analyze_content_for_threats(content, vip_name, platform)
-
-            # Add misinformation/impersonation heuristics and evidence scaffold
-            from .ai_analyzer import ai_analyzer as _analyzer_instance
-            flags = _analyzer_instance._detect_misinfo_impersonation(content, vip_name)  # internal heuristic
+            # AI analysis and the cached evidence enrichment (misinformation/impersonation
+            # heuristics, NER, sentiment) are independent, so run them together
+            ai_analysis, enrichment = await asyncio.gather(
+                analyze_content_for_threats(content, vip_name, platform),
+                _analyzer_instance.enrich_threat_evidence(content, vip_name)
+            )
+            flags = enrichment['flags']
             
-            # Update threat data with AI analysis
-            threat_data.update({
-                'threat_type': ai_analysis.get('threat_type', threat_data.get('threat_type', 'unknown')),
-                'severity': ai_analysis.get('severity', threat_data.get('severity', 'low')),
-                'confidence_score': ai_analysis.get('confidence', threat_data.get('confidence_score', 0.5)),
-                'ai_analysis': ai_analysis.get('analysis_details', {}),
-                'recommendations': ai_analysis.get('recommendations', []),
-                'analyzed_at': datetime.utcnow()
-            })
-
-            # Attach misinformation/impersonation evidence
-            threat_data.setdefault('evidence', {})
-            threat_data['evidence'].update({
+            # Update threat data with AI analysis and evidence in one pass
+            evidence = threat_data.get('evidence') or {}
+            evidence.update({
                 'is_misinformation': flags.get('is_misinformation', False),
                 'is_impersonation': flags.get('is_impersonation', False),
                 'misinformation_reasons': flags.get('misinformation_reasons', []),
@@ -164,35 +270,79 @@ class VIPMonitoringService:
                 'source_url': threat_data.get('source_url'),
                 'platform': platform,
             })
-            
-            # Only save if threat score is above threshold
-            # Enrich with basic NLP (NER, sentiment) for context
-            try:
-                from .ai_analyzer import ai_analyzer as _analyzer_instance
-                sentiment = await _analyzer_instance._analyze_sentiment(content)
-                entities = _analyzer_instance._extract_entities(content)
-                threat_data.setdefault('evidence', {})
-                threat_data['evidence'].update({
-                    'sentiment': sentiment,
-                    'entities': entities[:10]
-                })
-            except Exception:
-                pass
+            if 'sentiment' in enrichment:
+                evidence['sentiment'] = enrichment['sentiment']
+                evidence['entities'] = enrichment['entities']
+            threat_data.update({
+                'threat_type': ai_analysis.get('threat_type', threat_data.get('threat_type', 'unknown')),
+                'severity': ai_analysis.get('severity', threat_data.get('severity', 'low')),
+                'confidence_score': ai_analysis.get('confidence', threat_data.get('confidence_score', 0.5)),
+                'ai_analysis': ai_analysis.get('analysis_details', {}),
+                'recommendations': ai_analysis.get('recommendations', []),
+                'analyzed_at': datetime.utcnow(),
+                'evidence': evidence
+            })
 
             threat_threshold = float(os.getenv('THREAT_CONFIDENCE_THRESHOLD', '0.7'))
             if ai_analysis.get('threat_score', 0) >= threat_threshold:
                 
-                # Save to database
-                await self.database.threat_alerts.insert_one(threat_data)
+                # Save to database; the unique (content_hash, vip_id) index makes the
+                # upsert a no-op when a concurrent loop already stored this threat
+                threat_data['content_hash'] = content_hash
+                threat_data.setdefault('created_at', datetime.utcnow())
+                upsert = UpdateOne(
+                    {'content_hash': content_hash, 'vip_id': threat_data.get('vip_id')},
+                    {'$setOnInsert': threat_data},
+                    upsert=True
+                )
+                # The dedup window is entered once the write succeeds, so a failed
+                # write is retried on the next scan instead of being suppressed
+                if immediate:
+                    await self._write_threats([(digest, upsert)])
+                else:
+                    self._pending_threats.append((digest, upsert))
                 
                 logger.info(f"New threat detected: {threat_data['threat_type']} ({threat_data['severity']}) for {vip_name}")
                 
                 # Send real-time notification if needed
                 await self._send_threat_notification(threat_data)
+            else:
+                # Analyzed and below the threshold: nothing to store, skip it for the window
+                self._mark_seen(digest)
                 
         except Exception as e:
             logger.error(f"Error processing threat: {e}")
     
+    @staticmethod
+    def _dedup_digest(content: str, vip_id: Any) -> bytes:
+        return hashlib.sha1(f"{vip_id}|{content[:4000]}".encode('utf-8', 'ignore')).digest()
+    
+    async def _seen_recently(self, digest: bytes, content_hash: str, vip_id: Any) -> bool:
+        """Whether this content was stored or ruled out within the dedup window"""
+        expiry = self._recent_hashes.get(digest)
+        if expiry is not None and expiry > time.time():
+            return True
+        if time.time() < self._dedup_cold_until:
+            # Threats stored before a restart are not in memory yet
+            existing_threat = await self.database.threat_alerts.find_one({
+                "content_hash": content_hash,
+                "vip_id": vip_id,
+                "created_at": {"$gte": datetime.utcnow() - timedelta(seconds=DEDUP_WINDOW_SECONDS)}
+            }, projection={"_id": 1})
+            if existing_threat:
+                self._mark_seen(digest)
+                return True
+        return False
+    
+    def _mark_seen(self, digest: bytes):
+        """Enter content into the dedup window"""
+        now = time.time()
+        self._recent_hashes[digest] = now + DEDUP_WINDOW_SECONDS
+        self._hashes_since_prune += 1
+        if self._hashes_since_prune >= DEDUP_PRUNE_EVERY:
+            self._hashes_since_prune = 0
+            self._recent_hashes = {h: t for h, t in self._recent_hashes.items() if t > now}
+    
     async def _send_threat_notification(self, threat_data: Dict[str, Any]):
         """Send real-time threat notification"""
         try:
@@ -210,48 +360,36 @@ class VIPMonitoringService:
         except Exception as e:
             logger.error(f"Error sending threat notification: {e}")
     
-    async def _cleanup_old_threats(self):
-        """Periodically clean up old threat data"""
-        while self.is_running:
-            try:
-                # Clean up threats older than 30 days
-                cutoff_date = datetime.utcnow() - timedelta(days=30)
-                
-                result = await self.database.threat_alerts.delete_many({
-                    "created_at": {"$lt": cutoff_date},
-                    "status": "resolved"
-                })
-                
-                if result.deleted_count > 0:
-                    logger.info(f"Cleaned up {result.deleted_count} old resolved threats")
-                
-                # Sleep for 24 hours before next cleanup
-                await asyncio.sleep(86400)
-                
-            except asyncio.CancelledError:
-                logger.info("Cleanup task cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
-                await asyncio.sleep(3600)  # Retry in 1 hour
-    
-    async def get_monitoring_status(self) -> Dict[str, Any]:
-        """Get current monitoring status"""
-        active_monitors = []
-        for monitor in self.monitors:
-            active_monitors.append({
+    def _build_monitor_meta(self) -> List[Dict[str, Any]]:
+        return [
+            {
                 'platform': monitor.platform_name,
                 'enabled': monitor.is_enabled,
                 'api_configured': monitor.is_api_configured()
-            })
+            }
+            for monitor in self.monitors
+        ]
+    
+    def invalidate_monitor_meta(self):
+        """Refresh the cached monitor status after a configuration reload"""
+        self._monitor_meta = self._build_monitor_meta()
+    
+    async def get_monitoring_status(self) -> Dict[str, Any]:
+        """Get current monitoring status"""
+        active_monitors = [dict(meta) for meta in self._monitor_meta]
         
-        # Get VIP count
-        vip_count = await self.database.vip_profiles.count_documents({"status": "active"})
+        # Get VIP count, cached briefly since dashboards poll this endpoint
+        now = time.time()
+        if now >= self._vip_count_expires:
+            self._vip_count = await self.database.vip_profiles.count_documents({"status": "active"})
+            self._vip_count_expires = now + STATUS_COUNT_TTL_SECONDS
+        vip_count = self._vip_count
         
         # Get recent threat count
-        recent_threats = await self.database.threat_alerts.count_documents({
-            "created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        })
+        recent_threats = await self.database.threat_alerts.count_documents(
+            {"created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}},
+            hint=[("created_at", -1)]
+        )
         
         return {
             'is_running': self.is_running,
@@ -276,7 +414,7 @@ class VIPMonitoringService:
                 try:
                     threats = await monitor.monitor_vip(vip)
                     for threat_data in threats:
-                        await self._process_threat(threat_data, vip)
+                        await self._process_threat(threat_data, vip, immediate=True)
                         all_threats.append(threat_data)
                 except Exception as e:
                     logger.error(f"Error in manual scan on {monitor.platform_name}: {e}")
@@ -294,10 +432,14 @@ class VIPMonitoringService:
 
 # Global monitoring service instance
 monitoring_service = None
+_svc_lock = asyncio.Lock()
 
-def get_monitoring_service(database) -> VIPMonitoringService:
+async def get_monitoring_service(database) -> VIPMonitoringService:
     """Get or create the global monitoring service instance"""
     global monitoring_service
     if monitoring_service is None:
-        monitoring_service = VIPMonitoringService(database)
+        # Concurrent first callers share one instance (and one set of platform loops)
+        async with _svc_lock:
+            if monitoring_service is None:
+                monitoring_service = VIPMonitoringService(database)
     return monitoring_service
\ No newline at end of file
@@ -1,17 +1,23 @@
 import argparse
 import csv
 import os
-from typing import List, Tuple
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
 
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 
 from .ml_model import build_default_pipeline, save_model
 
 
-def read_csv_dataset(path: str) -> Tuple[List[str], List[str]]:
-    texts: List[str] = []
-    labels: List[str] = []
+BATCH_SIZE = 4096
+# Every HOLDOUT_EVERY-th row of each label is held out for evaluation: a stratified
+# split that needs only one counter per label instead of an index over the dataset
+HOLDOUT_EVERY = 5
+
+
+def _iter_rows(path: str) -> Iterator[Tuple[bool, str, str]]:
+    """Yield (is_holdout, text, label) for each usable row"""
+    seen: Counter = Counter()
     with open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         # Expect columns: text,label
@@ -19,37 +25,71 @@ def read_csv_dataset(path: str) -> Tuple[List[str], List[str]]:
             t = (row.get('text') or '').strip()
             y = (row.get('label') or '').strip()
             if t and y:
-                texts.append(t)
-                labels.append(y)
-    return texts, labels
+                seen[y] += 1
+                yield seen[y] % HOLDOUT_EVERY == 0, t, y
+
+
+def read_csv_dataset(path: str, batch_size: int = BATCH_SIZE, holdout: bool = False) -> Iterator[Tuple[List[str], List[str]]]:
+    """Stream (texts, labels) batches of the training rows, or of the held-out rows"""
+    texts: List[str] = []
+    labels: List[str] = []
+    for is_holdout, t, y in _iter_rows(path):
+        if is_holdout != holdout:
+            continue
+        texts.append(t)
+        labels.append(y)
+        if len(texts) >= batch_size:
+            yield texts, labels
+            texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+def count_labels(path: str) -> Counter:
+    """Single pass over the CSV counting training rows per label"""
+    return Counter(y for is_holdout, _, y in _iter_rows(path) if not is_holdout)
+
+
+def _balanced_weights(counts: Counter) -> Dict[str, float]:
+    # partial_fit does not accept class_weight='balanced'; this is the same formula
+    total = sum(counts.values())
+    return {label: total / (len(counts) * n) for label, n in counts.items()}
 
 
 def main():
     parser = argparse.ArgumentParser(description='Train threat classification model from CSV')
     parser.add_argument('--data', required=True, help='Path to CSV with columns: text,label')
     parser.add_argument('--out', default=None, help='Output model path (optional)')
+    parser.add_argument('--epochs', type=int, default=5, help='Passes over the training rows')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows per partial_fit call')
     args = parser.parse_args()
 
-    texts, labels = read_csv_dataset(args.data)
-    X_train, X_test, y_train, y_test = train_test_split(texts, labels, test_size=0.2, random_state=42, stratify=labels)
+    counts = count_labels(args.data)
+    unique_labels = sorted(counts)
 
     pipeline = build_default_pipeline()
-    pipeline.fit(X_train, y_train)
+    pipeline.set_params(clf__class_weight=_balanced_weights(counts))
+    vectorizer, clf = pipeline.named_steps['hv'], pipeline.named_steps['clf']
+    for _ in range(args.epochs):
+        for texts, labels in read_csv_dataset(args.data, args.batch_size):
+            clf.partial_fit(vectorizer.transform(texts), labels, classes=unique_labels)
 
-    y_pred = pipeline.predict(X_test)
-    print(classification_report(y_test, y_pred))
+    y_test: List[str] = []
+    y_pred: List[str] = []
+    for texts, labels in read_csv_dataset(args.data, args.batch_size, holdout=True):
+        y_test.extend(labels)
+        y_pred.extend(pipeline.predict(texts))
+    if y_test:
+        print(classification_report(y_test, y_pred))
 
     out_path = args.out or None
     if out_path is None:
         from .ml_model import DEFAULT_MODEL_PATH
         out_path = DEFAULT_MODEL_PATH
 
-    unique_labels = sorted(set(labels))
     save_model(pipeline, unique_labels, out_path)
     print(f"Model saved to: {out_path}")
 
 
 if __name__ == '__main__':
     main()
-
-
@@ -4,44 +4,35 @@ Quick Test for Protego ML System
 Simple verification that components are working
 """
 
+import importlib
 import os
 import sys
 
+# (result key, module, attributes used by the rest of the suite)
+IMPORT_PROBES = [
+    ("ml_classifier", "ml_classifier", ("classify_text", "is_high_risk_content")),
+    ("fact_checker", "fact_checker", ("enhanced_fact_check",)),
+    ("enhanced_integration", "enhanced_ml_integration", ("enhanced_content_analysis",)),
+    ("ml_service", "ml_service", ("ProtegoMLService",)),
+]
+
+def _probe_import(module_name, attrs):
+    """Import a module and check it exposes the expected attributes"""
+    try:
+        module = importlib.import_module(module_name)
+        for attr in attrs:
+            getattr(module, attr)
+        return "✅ Available"
+    except Exception as e:
+        return f"❌ Error: {e}"
+
 def test_imports():
     """Test if all components can be imported"""
     print("🔍 Testing imports...")
     
-    results = {}
-    
-    # Test ML classifier
-    try:
-        from ml_classifier import classify_text, is_high_risk_content
-        results["ml_classifier"] = "✅ Available"
-    except Exception as e:
-        results["ml_classifier"] = f"❌ Error: {e}"
-    
-    # Test fact checker
-    try:
-        from fact_checker import enhanced_fact_check
-        results["fact_checker"] = "✅ Available"
-    except Exception as e:
-        results["fact_checker"] = f"❌ Error: {e}"
-    
-    # Test enhanced integration
-    try:
-        from enhanced_ml_integration import enhanced_content_analysis
-        results["enhanced_integration"] = "✅ Available"
-    except Exception as e:
-        results["enhanced_integration"] = f"❌ Error: {e}"
-    
-    # Test ML service
-    try:
-        from ml_service import ProtegoMLService
-        results["ml_service"] = "✅ Available"
-    except Exception as e:
-        results["ml_service"] = f"❌ Error: {e}"
-    
-    return results
+    # In dependency order: later components import the earlier ones, so each
+    # failure is reported against the module that actually raised it
+    return {key: _probe_import(module_name, attrs) for key, module_name, attrs in IMPORT_PROBES}
 
 def create_sample_models():
     """Create minimal sample models for testing"""
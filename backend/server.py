@@ -1,20 +1,30 @@
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Union
 from datetime import datetime, timedelta
 from bson import ObjectId
+from cachetools import TTLCache
 import asyncio
+import functools
 import logging
 import os
 from dotenv import load_dotenv
 import json
 import uuid
 import sys
+import zlib
+
+# ORJSONResponse needs orjson; fall back to the stdlib encoder without it
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Ensure project root is on sys.path when running as a script (python backend/server.py)
 _CURRENT_DIR = os.path.dirname(__file__)
@@ -30,7 +40,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # FastAPI app
-app = FastAPI(title="Protego - VIP Threat Monitoring API", version="1.0.0")
+app = FastAPI(
+    title="Protego - VIP Threat Monitoring API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -45,30 +59,116 @@ app.add_middleware(
 mongodb_client = None
 database = None
 
+# Outbound messages buffered per client; a client this far behind loses its oldest ones
+WS_SEND_QUEUE_SIZE = int(os.getenv('WS_SEND_QUEUE_SIZE', '256'))
+
+# zlib level for broadcasts to clients that connect with ?compress=zlib
+WS_COMPRESS_LEVEL = int(os.getenv('WS_COMPRESS_LEVEL', '6'))
+
 # WebSocket connections manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # Each socket gets a bounded outbound queue drained by its own writer task;
+        # items are JSON text, or zlib-compressed bytes for compressed sockets
+        self.active_connections: Dict[WebSocket, "asyncio.Queue[Union[str, bytes]]"] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        # Sockets that asked for zlib-compressed binary frames instead of JSON text
+        self._compressed: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if websocket.query_params.get("compress") == "zlib":
+            self._compressed.add(websocket)
+        queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        self._compressed.discard(websocket)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _writer(self, websocket: WebSocket, queue: "asyncio.Queue[Union[str, bytes]]"):
+        try:
+            while True:
+                message = await queue.get()
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)
+                else:
+                    await websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(websocket)
+
+    @staticmethod
+    def _enqueue(queue: "asyncio.Queue[Union[str, bytes]]", message: Union[str, bytes]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        queue = self.active_connections.get(websocket)
+        if queue is not None:
+            self._enqueue(queue, message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                pass
+        # Enqueue only: a slow client backs up its own queue, never the caller or other clients.
+        # The compressed frame is built once and the same bytes shared by every client using it
+        compressed = None
+        for websocket, queue in self.active_connections.items():
+            if websocket in self._compressed:
+                if compressed is None:
+                    compressed = zlib.compress(message.encode(), WS_COMPRESS_LEVEL)
+                self._enqueue(queue, compressed)
+            else:
+                self._enqueue(queue, message)
 
 manager = ConnectionManager()
 
+# Serialized by pydantic's compiled encoder (datetimes included). The model is encoded
+# rather than the dict given to insert_one, which Mongo mutates with an ObjectId _id
+def _event_payload(event_type: str, model: BaseModel) -> str:
+    return f'{{"type": {json.dumps(event_type)}, "data": {model.model_dump_json()}}}'
+
+async def _broadcast_event(event_type: str, model: BaseModel):
+    await manager.broadcast(_event_payload(event_type, model))
+
+# Seconds a dashboard stats/analytics response is reused before the database is queried again
+STATS_CACHE_TTL_SECONDS = float(os.getenv('STATS_CACHE_TTL_SECONDS', '5'))
+# (endpoint name, arguments) -> task computing the response
+_response_cache = TTLCache(maxsize=32, ttl=STATS_CACHE_TTL_SECONDS)
+
+def _ttl_cached(func):
+    """Share one computation per argument set for STATS_CACHE_TTL_SECONDS.
+
+    Callers arriving while it runs await the same task, so a burst of dashboard polls
+    costs one query.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        task = _response_cache.get(key)
+        if task is None:
+            task = _response_cache[key] = asyncio.ensure_future(func(*args, **kwargs))
+        try:
+            # Shielded so one client disconnecting doesn't cancel the shared query
+            return await asyncio.shield(task)
+        except Exception:
+            # Errors are not cached; the next caller retries
+            if _response_cache.get(key) is task:
+                del _response_cache[key]
+            raise
+
+    def invalidate():
+        for key in [key for key in _response_cache if key[0] == func.__name__]:
+            _response_cache.pop(key, None)
+
+    wrapper.invalidate = invalidate
+    return wrapper
+
 # Pydantic models
 class VIPProfile(BaseModel):
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -96,6 +196,17 @@ class ThreatAlert(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     analyzed_at: Optional[datetime] = None
 
+# List views skip what they never render: Mongo's _id, the monitoring service's analysis
+# extras (not ThreatAlert fields) and inline base64 screenshots (the UI links screenshot_url)
+THREAT_LIST_PROJECTION = {
+    "_id": 0,
+    "ai_analysis": 0,
+    "recommendations": 0,
+    "content_hash": 0,
+    "evidence.screenshot": 0
+}
+VIP_LIST_PROJECTION = {"_id": 0, **{field: 1 for field in VIPProfile.model_fields}}
+
 class MonitoringStats(BaseModel):
     total_vips: int
     active_monitors: int
@@ -110,17 +221,60 @@ async def startup_event():
     global mongodb_client, database
     try:
         mongo_url = os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017")
-        mongodb_client = AsyncIOMotorClient(mongo_url)
+        # Pool sized for the monitoring fan-out (concurrent per-VIP scans and threat writes)
+        mongodb_client = AsyncIOMotorClient(
+            mongo_url,
+            maxPoolSize=int(os.getenv('MONGO_MAX_POOL', '200')),
+            minPoolSize=int(os.getenv('MONGO_MIN_POOL', '20')),
+            waitQueueTimeoutMS=5000,
+            compressors=os.getenv('MONGO_COMPRESSORS', 'zstd,zlib'),
+            retryWrites=True
+        )
         database = mongodb_client.protego
         logger.info("Connected to MongoDB successfully")
         
         # Create indexes
         await database.vip_profiles.create_index("name")
+        await database.vip_profiles.create_index([("status", 1), ("platforms", 1)])
         await database.threat_alerts.create_index([("vip_id", 1), ("created_at", -1)])
-        await database.threat_alerts.create_index("severity")
+        # Equality fields first, then the created_at sort, so /api/stats counts and the
+        # filtered /api/threats listings are answered from the index; this also serves
+        # severity-only filters, which the old single-field severity index covered
+        await database.threat_alerts.create_index([("severity", 1), ("status", 1), ("created_at", -1)])
+        await database.threat_alerts.create_index([("status", 1), ("created_at", -1)])
+        await database.threat_alerts.create_index([("created_at", -1)])
         
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
+        return
+    
+    # Lookups and updates by the application-level id; documents without one are skipped
+    for collection in (database.vip_profiles, database.threat_alerts):
+        await _create_optional_index(
+            collection, "id",
+            unique=True,
+            partialFilterExpression={"id": {"$exists": True}}
+        )
+    # One stored alert per (content, VIP); the monitoring service upserts on this pair
+    await _create_optional_index(
+        database.threat_alerts, [("content_hash", 1), ("vip_id", 1)],
+        unique=True,
+        partialFilterExpression={"content_hash": {"$exists": True}}
+    )
+    # Resolved threats expire server-side 30 days after creation
+    await _create_optional_index(
+        database.threat_alerts, [("created_at", 1)],
+        expireAfterSeconds=30 * 86400,
+        partialFilterExpression={"status": "resolved"}
+    )
+
+async def _create_optional_index(collection, keys, **options):
+    """Create a unique/TTL index, logging rather than raising when existing data or an
+    older index with the same keys prevents it, so the remaining indexes still get built"""
+    try:
+        await collection.create_index(keys, **options)
+    except Exception as e:
+        logger.error(f"Failed to create index {keys!r} on {collection.name}: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -158,19 +312,22 @@ class AnalyzeRequest(BaseModel):
     platform: str = "unknown"
 
 @app.get("/api/stats", response_model=MonitoringStats) 
+@_ttl_cached
 async def get_monitoring_stats():
     try:
-        total_vips = await database.vip_profiles.count_documents({"status": "active"})
-        
         today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        threats_today = await database.threat_alerts.count_documents({
-            "created_at": {"$gte": today}
-        })
         
-        high_severity_threats = await database.threat_alerts.count_documents({
-            "severity": "high",
-            "status": {"$ne": "resolved"}
-        })
+        # Independent counts, issued together so the endpoint waits one round-trip
+        total_vips, threats_today, high_severity_threats = await asyncio.gather(
+            database.vip_profiles.count_documents({"status": "active"}),
+            database.threat_alerts.count_documents({
+                "created_at": {"$gte": today}
+            }),
+            database.threat_alerts.count_documents({
+                "severity": "high",
+                "status": {"$ne": "resolved"}
+            })
+        )
         
         return MonitoringStats(
             total_vips=total_vips,
@@ -185,23 +342,13 @@ async def get_monitoring_stats():
         raise HTTPException(status_code=500, detail="Failed to get monitoring stats")
 
 @app.post("/api/vips", response_model=VIPProfile)
-async def create_vip_profile(vip: VIPProfile):
+async def create_vip_profile(vip: VIPProfile, background_tasks: BackgroundTasks):
     try:
         vip_dict = vip.dict()
         result = await database.vip_profiles.insert_one(vip_dict)
         
-        # Broadcast new VIP added (convert datetime to string and remove ObjectId for JSON serialization)
-        broadcast_data = vip_dict.copy()
-        # Remove MongoDB ObjectId if present
-        broadcast_data.pop('_id', None)
-        for key, value in broadcast_data.items():
-            if isinstance(value, datetime):
-                broadcast_data[key] = value.isoformat()
-        
-        await manager.broadcast(json.dumps({
-            "type": "vip_added",
-            "data": broadcast_data
-        }))
+        # Broadcast new VIP added once the response has been sent
+        background_tasks.add_task(_broadcast_event, "vip_added", vip)
         
         return vip
     except Exception as e:
@@ -211,10 +358,10 @@ async def create_vip_profile(vip: VIPProfile):
 @app.get("/api/vips", response_model=List[VIPProfile])
 async def get_vip_profiles():
     try:
-        profiles = []
-        async for profile in database.vip_profiles.find({"status": "active"}):
-            profiles.append(VIPProfile(**profile))
-        return profiles
+        profiles = await database.vip_profiles.find(
+            {"status": "active"}, VIP_LIST_PROJECTION
+        ).to_list(length=None)
+        return [VIPProfile(**profile) for profile in profiles]
     except Exception as e:
         logger.error(f"Error getting VIP profiles: {e}")
         raise HTTPException(status_code=500, detail="Failed to get VIP profiles")
@@ -281,32 +428,27 @@ async def get_threat_alerts(
         if status:
             filter_query["status"] = status
             
-        threats = []
-        async for threat in database.threat_alerts.find(filter_query).sort("created_at", -1).limit(limit):
-            threats.append(ThreatAlert(**threat))
-        return threats
+        # One batch of `limit` documents fetched in a single await
+        cursor = database.threat_alerts.find(
+            filter_query, THREAT_LIST_PROJECTION
+        ).sort("created_at", -1).limit(limit).batch_size(limit)
+        threats = await cursor.to_list(length=limit)
+        return [ThreatAlert(**threat) for threat in threats]
     except Exception as e:
         logger.error(f"Error getting threat alerts: {e}")
         raise HTTPException(status_code=500, detail="Failed to get threat alerts")
 
 @app.post("/api/threats", response_model=ThreatAlert)
-async def create_threat_alert(threat: ThreatAlert):
+async def create_threat_alert(threat: ThreatAlert, background_tasks: BackgroundTasks):
     try:
         threat_dict = threat.dict()
         result = await database.threat_alerts.insert_one(threat_dict)
         
-        # Broadcast new threat alert (convert datetime to string and remove ObjectId for JSON serialization)
-        broadcast_data = threat_dict.copy()
-        # Remove MongoDB ObjectId if present
-        broadcast_data.pop('_id', None)
-        for key, value in broadcast_data.items():
-            if isinstance(value, datetime):
-                broadcast_data[key] = value.isoformat()
+        # Today's count just changed
+        get_monitoring_stats.invalidate()
         
-        await manager.broadcast(json.dumps({
-            "type": "new_threat",
-            "data": broadcast_data
-        }))
+        # Broadcast new threat alert once the response has been sent
+        background_tasks.add_task(_broadcast_event, "new_threat", threat)
         
         return threat
     except Exception as e:
@@ -330,6 +472,7 @@ async def update_threat_status(threat_id: str, status: str):
         raise HTTPException(status_code=500, detail="Failed to update threat status")
 
 @app.get("/api/analytics/threats-by-platform")
+@_ttl_cached
 async def get_threats_by_platform():
     try:
         pipeline = [
@@ -345,6 +488,7 @@ async def get_threats_by_platform():
         raise HTTPException(status_code=500, detail="Failed to analyze threats by platform")
 
 @app.get("/api/analytics/severity-distribution")
+@_ttl_cached
 async def get_severity_distribution():
     try:
         pipeline = [
@@ -398,12 +542,11 @@ async def get_recent_threats(hours: int = 24, limit: int = 50):
     """Get recent threats within specified time window"""
     try:
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        threats = []
-        async for threat in database.threat_alerts.find({
+        cursor = database.threat_alerts.find({
             "created_at": {"$gte": cutoff_time}
-        }).sort("created_at", -1).limit(limit):
-            threats.append(ThreatAlert(**threat))
-        return threats
+        }, THREAT_LIST_PROJECTION).sort("created_at", -1).limit(limit).batch_size(limit)
+        threats = await cursor.to_list(length=limit)
+        return [ThreatAlert(**threat) for threat in threats]
     except Exception as e:
         logger.error(f"Error getting recent threats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get recent threats")
@@ -421,6 +564,7 @@ async def clear_threats(confirm: bool = False):
         raise HTTPException(status_code=500, detail="Failed to clear threats")
 
 @app.get("/api/analytics/threat-timeline")
+@_ttl_cached
 async def get_threat_timeline(days: int = 7):
     """Get threat count timeline for the past N days"""
     try:
@@ -431,24 +575,17 @@ async def get_threat_timeline(days: int = 7):
                 }
             },
             {
+                # One formatted day key per document; YYYY-MM-DD also sorts chronologically
                 "$group": {
-                    "_id": {
-                        "year": {"$year": "$created_at"},
-                        "month": {"$month": "$created_at"},
-                        "day": {"$dayOfMonth": "$created_at"}
-                    },
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
                     "count": {"$sum": 1}
                 }
             },
-            {"$sort": {"_id": 1}}
+            {"$sort": {"_id": 1}},
+            {"$project": {"_id": 0, "date": "$_id", "count": 1}}
         ]
         
-        result = []
-        async for doc in database.threat_alerts.aggregate(pipeline):
-            date_str = f"{doc['_id']['year']}-{doc['_id']['month']:02d}-{doc['_id']['day']:02d}"
-            result.append({"date": date_str, "count": doc["count"]})
-        
-        return result
+        return await database.threat_alerts.aggregate(pipeline).to_list(length=None)
     except Exception as e:
         logger.error(f"Error getting threat timeline: {e}")
         raise HTTPException(status_code=500, detail="Failed to get threat timeline")
@@ -459,8 +596,8 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
-            # Echo back for heartbeat
-            await websocket.send_text(f"Connected: {data}")
+            # Echo back for heartbeat, through the socket's writer like every other send
+            await manager.send_personal_message(f"Connected: {data}", websocket)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -476,7 +613,7 @@ monitoring_service = None
 async def start_monitoring():
     global monitoring_service
     try:
-        monitoring_service = get_monitoring_service(database)
+        monitoring_service = await get_monitoring_service(database)
         await monitoring_service.start_monitoring()
         logger.info("Real-time VIP monitoring service started")
     except Exception as e:
@@ -533,10 +670,7 @@ async def simulate_monitoring():
                 await database.threat_alerts.insert_one(threat.dict())
                 
                 # Broadcast new threat
-                await manager.broadcast(json.dumps({
-                    "type": "new_threat",
-                    "data": threat.dict()
-                }))
+                await manager.broadcast(_event_payload("new_threat", threat))
                 
                 logger.info(f"Demo threat generated: {threat_type} for {vip['name']}")
                 
@@ -559,4 +693,10 @@ except Exception as _e:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    # libuv-based event loop for the API and monitoring loops where installed
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    uvicorn.run(app, host="127.0.0.1", port=8000, loop=loop)
\ No newline at end of file
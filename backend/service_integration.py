@@ -9,11 +9,50 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 
 # Import our ML components
-from .ml_classifier import classify_text, is_high_risk_content
-from .content_logger import save_alert
+from .ml_classifier import classify_text, classify_texts, is_high_risk_result
+from .content_logger import save_alert, save_alerts
+
+# Single-pass multi-keyword matching for VIP mentions
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# This is a placeholder - in production you'd have a list of VIPs to monitor.
+# Earlier entries win when a post mentions several
+VIP_KEYWORDS = (
+    "president", "senator", "governor", "mayor", "ceo", "celebrity"
+)
+
+def _build_vip_automaton(keywords):
+    if not AHOCORASICK_AVAILABLE or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_vip_automaton = _build_vip_automaton(VIP_KEYWORDS)
+
+def set_vip_keywords(keywords) -> None:
+    """Replace the monitored VIP keywords (e.g. after VIP profiles change) and rebuild the matcher"""
+    global VIP_KEYWORDS, _vip_automaton
+    keywords = tuple(keyword.lower() for keyword in keywords)
+    # Swap both together so a concurrent lookup never pairs new keywords with an old automaton
+    VIP_KEYWORDS, _vip_automaton = keywords, _build_vip_automaton(keywords)
+
+def _should_flag(result: Dict[str, Any], is_high_risk: bool) -> bool:
+    """Whether classified content gets flagged and logged"""
+    return (
+        result.get("is_fake", False) or
+        is_high_risk or
+        result.get("confidence", 0) > 0.6
+    )
+
 def process_incoming_post(post_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process incoming post through ML classification pipeline
@@ -42,15 +81,11 @@ def process_incoming_post(post_data: Dict[str, Any]) -> Dict[str, Any]:
         # Classify the text
         result = classify_text(text)
         
-        # Check if this is high-risk content
-        is_high_risk = is_high_risk_content(text)
+        # Check if this is high-risk content, reusing the classification above
+        is_high_risk = is_high_risk_result(result)
         
         # Determine if we should flag this content
-        should_flag = (
-            result.get("is_fake", False) or
-            is_high_risk or
-            result.get("confidence", 0) > 0.6
-        )
+        should_flag = _should_flag(result, is_high_risk)
         
         processing_result = {
             "status": "processed",
@@ -119,21 +154,53 @@ def batch_process_posts(posts: list) -> Dict[str, Any]:
         "processing_time": datetime.now().isoformat()
     }
     
+    # Empty posts are skipped, as process_incoming_post does, but still count as processed;
+    # malformed ones (not a dict, non-text content) are counted as errors
+    batch = []
     for post in posts:
         try:
-            result = process_incoming_post(post)
-            results["total_processed"] += 1
-            
-            if result.get("flagged"):
-                results["flagged_count"] += 1
-            
-            if result.get("is_high_risk"):
-                results["high_risk_count"] += 1
-                
+            if (post.get("content") or "").strip():
+                batch.append(post)
+            else:
+                results["total_processed"] += 1
         except Exception as e:
             results["error_count"] += 1
             logger.error(f"Batch processing error: {e}")
     
+    try:
+        # One classifier call for the whole batch instead of two per post
+        classifications = classify_texts([post["content"] for post in batch])
+    except Exception as e:
+        results["error_count"] += len(batch)
+        logger.error(f"Batch processing error: {e}")
+        return results
+    
+    alerts = []
+    for post, result in zip(batch, classifications):
+        results["total_processed"] += 1
+        is_high_risk = is_high_risk_result(result)
+        
+        if _should_flag(result, is_high_risk):
+            results["flagged_count"] += 1
+            alerts.append({
+                "text": post["content"],
+                "result": result,
+                "vip_name": post.get("vip_name"),
+                "platform": post.get("platform", "unknown"),
+                "user_id": post.get("user_id"),
+                "post_id": post.get("post_id"),
+                "url": post.get("url")
+            })
+        
+        if is_high_risk:
+            results["high_risk_count"] += 1
+            logger.critical(f"HIGH RISK content detected: {post['content'][:100]}...")
+    
+    # Flagged posts are written in a single transaction
+    if alerts:
+        save_alerts(alerts)
+        logger.warning(f"Flagged {len(alerts)} of {len(batch)} posts in batch")
+    
     return results
 
 # Example integration functions for different platforms
@@ -168,13 +235,16 @@ def extract_vip_mentions(text: str) -> Optional[str]:
     Extract VIP names from text (simplified implementation)
     In production, this would use a more sophisticated NER approach
     """
-    # This is a placeholder - in production you'd have a list of VIPs to monitor
-    vip_keywords = [
-        "president", "senator", "governor", "mayor", "ceo", "celebrity"
-    ]
-    
+    keywords, automaton = VIP_KEYWORDS, _vip_automaton
     text_lower = text.lower()
-    for keyword in vip_keywords:
+    if automaton is not None:
+        # One pass finds every keyword; the first in VIP_KEYWORDS order is reported
+        found = {keyword for _, keyword in automaton.iter(text_lower)}
+        if not found:
+            return None
+        return next(keyword for keyword in keywords if keyword in found)
+    
+    for keyword in keywords:
         if keyword in text_lower:
             return keyword
     
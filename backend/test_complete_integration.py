@@ -117,6 +117,51 @@ def test_content_logger():
         print(f"   ❌ Content Logger error: {e}")
         return False, None
 
+def test_threat_flush():
+    """Test that a buffered monitoring threat is written to threat_alerts"""
+    print("\n🗄️ Testing Monitoring Threat Flush...")
+    
+    try:
+        import asyncio
+        import hashlib
+        import uuid
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo import UpdateOne
+        from monitoring.service import VIPMonitoringService
+        
+        async def flush_one():
+            client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"),
+                                        serverSelectionTimeoutMS=3000)
+            # Throwaway database so the check never touches real alerts
+            database = client[f"protego_flush_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                service = VIPMonitoringService(database)
+                content = "Test threat content for flush check"
+                content_hash = hashlib.sha1(content.encode()).hexdigest()
+                digest = service._dedup_digest(content, "test_vip")
+                service._pending_threats.append((digest, UpdateOne(
+                    {"content_hash": content_hash, "vip_id": "test_vip"},
+                    {"$setOnInsert": {"content": content, "content_hash": content_hash,
+                                      "vip_id": "test_vip", "created_at": datetime.utcnow()}},
+                    upsert=True
+                )))
+                await service._flush_pending()
+                stored = await database.threat_alerts.find_one({"content_hash": content_hash})
+                return stored is not None, digest in service._recent_hashes
+            finally:
+                await client.drop_database(database.name)
+                client.close()
+        
+        stored, deduped = asyncio.run(flush_one())
+        print(f"   ✅ Threat stored: {stored}")
+        print(f"   🔁 Entered dedup window: {deduped}")
+        
+        return stored and deduped, stored
+        
+    except Exception as e:
+        print(f"   ❌ Threat flush error: {e}")
+        return False, None
+
 def run_complete_integration_test():
     """Run complete integration test suite"""
     print("🎯 Protego ML System - Complete Integration Test")
@@ -137,6 +182,9 @@ def run_complete_integration_test():
     logger_success, logger_result = test_content_logger()
     results["content_logger"] = {"success": logger_success, "result": logger_result}
     
+    flush_success, flush_result = test_threat_flush()
+    results["threat_flush"] = {"success": flush_success, "result": flush_result}
+    
     # Summary
     print("\n📊 Integration Test Summary")
     print("=" * 40)
@@ -157,6 +205,7 @@ def run_complete_integration_test():
         print("   - Fact-checking: ✅") 
         print("   - Enhanced integration: ✅")
         print("   - Content logging: ✅")
+        print("   - Threat storage: ✅")
     else:
         print("⚠️ Some components need attention")
         print("\n🔧 Next steps:")
@@ -217,7 +266,8 @@ if __name__ == "__main__":
     print("2. Fact Checker") 
     print("3. Enhanced Integration")
     print("4. Content Logger")
-    print("5. End-to-End Demo")
+    print("5. Monitoring Threat Flush")
+    print("6. End-to-End Demo")
     print()
     
     # Run integration tests